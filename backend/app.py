@@ -4,42 +4,139 @@ Provides REST API for symptom analysis and recommendations
 With SQLite database, authentication, and input validation
 """
 
-from flask import Flask, request, jsonify, render_template, redirect, url_for
+from flask import Flask, Response, request, session, jsonify, render_template, redirect, url_for
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from flask_caching import Cache
+from flask_compress import Compress
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
-from datetime import datetime, timedelta
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import selectinload
+from datetime import date, datetime, timedelta
+from collections import Counter
+import hashlib
 import os
+import queue
 import sys
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:  # no orjson wheels for PyPy; fall back to the stdlib encoder
+    orjson = None
 
 # Add the backend directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from models import db, User, Symptom, Remedy, DietPlan, SymptomRecord, VitalRecord, Reminder, init_db
+from models import (
+    db, User, Symptom, Remedy, DietPlan, SymptomRecord, SymptomFrequency,
+    VitalRecord, Reminder, init_db
+)
 from recommendation_engine import get_recommendation_engine
 from validators import (
     Validator, ValidationError, validate_json_request,
-    handle_validation_error, rate_limit
+    handle_validation_error
 )
 
+
+def _orjson_dumps_str(obj):
+    """orjson.dumps returning str, as SQLAlchemy's json_serializer expects"""
+    return orjson.dumps(obj).decode('utf-8')
+
+
+class ISODateJSONProvider(DefaultJSONProvider):
+    """Stdlib JSON provider writing dates as ISO 8601, the way orjson does"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+
+class ORJSONProvider(ISODateJSONProvider):
+    """JSON provider that encodes with orjson instead of the stdlib json module"""
+
+    # Non-str dict keys (e.g. ints) are written as strings, as json.dumps does
+    OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.OPTIONS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        # orjson has no object_hook; Flask's tagged session serializer
+        # passes one, so any keyword call goes to the stdlib decoder
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Build the body straight from orjson's bytes, skipping the
+        # bytes -> str -> bytes round trip of the default implementation
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.OPTIONS),
+            mimetype=self.mimetype
+        )
+
+
 # Initialize Flask app
 app = Flask(__name__,
             template_folder='../frontend/templates',
             static_folder='../frontend/static')
+# Model to_dict() results carry raw datetimes; both providers emit them
+# in the same ISO 8601 form
+app.json = ORJSONProvider(app) if orjson is not None else ISODateJSONProvider(app)
 
 # Configuration
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(os.path.dirname(__file__), 'data', 'health.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'query_cache_size': 1200,  # Compiled SQL statements kept for reuse
+    'pool_size': 20,
+    'max_overflow': 40,
+    'pool_pre_ping': True
+}
+if orjson is not None:
+    # JSON columns (remedy ingredients, symptom history, ...) go through
+    # orjson too
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'].update(
+        json_serializer=_orjson_dumps_str,
+        json_deserializer=orjson.loads
+    )
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
+app.config['REMEMBER_COOKIE_DURATION'] = timedelta(days=30)
+app.config['CACHE_TYPE'] = os.environ.get('CACHE_TYPE', 'SimpleCache')
+app.config['CACHE_DEFAULT_TIMEOUT'] = 300
+# Use redis://host:6379 in production so limits are shared across workers
+app.config['RATELIMIT_STORAGE_URI'] = os.environ.get('RATELIMIT_STORAGE_URI', 'memory://')
+# Two counters per key weighted across the window boundary: O(1) like a
+# fixed window, without letting a client burst twice the limit at the edge
+app.config['RATELIMIT_STRATEGY'] = 'sliding-window-counter'
+# Set COMPRESS_REGISTER=false when a reverse proxy already compresses
+app.config['COMPRESS_REGISTER'] = os.environ.get('COMPRESS_REGISTER', 'true').lower() == 'true'
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html']
+app.config['COMPRESS_LEVEL'] = 5
+app.config['COMPRESS_MIN_SIZE'] = 1024
 
 # Initialize extensions
 CORS(app, supports_credentials=True)
+cache = Cache(app)
+Compress(app)
+limiter = Limiter(get_remote_address, app=app)
 init_db(app)
 
 # Initialize Flask-Login
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login_page'
+# 'strong' would drop the session whenever the client IP/agent hash changes,
+# forcing another password check; 'basic' only marks it non-fresh
+login_manager.session_protection = 'basic'
 
 
 @login_manager.user_loader
@@ -47,6 +144,12 @@ def load_user(user_id):
     return User.query.get(int(user_id))
 
 
+def _cache_user_in_session(user):
+    """Store the user's public profile in the signed session cookie"""
+    # Lets /api/auth/me answer without loading the user from the database
+    session['user_dict'] = user.to_dict()
+
+
 @login_manager.unauthorized_handler
 def unauthorized():
     if request.path.startswith('/api/'):
@@ -57,12 +160,97 @@ def unauthorized():
 # Initialize recommendation engine
 engine = get_recommendation_engine()
 
+# The knowledge base does not change at runtime, so the full listings are
+# sorted and serialized once here instead of on every request
+_SYMPTOMS_JSON = app.json.dumps({'symptoms': sorted(engine.get_all_symptoms())}).encode('utf-8')
+_REMEDIES_JSON = app.json.dumps({'success': True, 'remedies': engine.get_all_remedies()}).encode('utf-8')
+_DIETS_JSON = app.json.dumps({'success': True, 'diet_plans': engine.get_all_diet_plans()}).encode('utf-8')
+
+# Content hashes let warm clients revalidate with If-None-Match and get a 304
+_SYMPTOMS_ETAG = hashlib.sha256(_SYMPTOMS_JSON).hexdigest()
+_REMEDIES_ETAG = hashlib.sha256(_REMEDIES_JSON).hexdigest()
+_DIETS_ETAG = hashlib.sha256(_DIETS_JSON).hexdigest()
+
+
+def _json_body_response(body, etag):
+    """Wrap a pre-serialized JSON body in a fresh, conditional response"""
+    # A new Response per request keeps per-request headers (CORS, cookies)
+    # from leaking between clients; only the body bytes are shared
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 300
+    return response.make_conditional(request)
+
+
+# ==================== Background History Writer ====================
+
+# Symptom history is written off the request path: analyze_symptoms
+# enqueues a row and a single writer thread commits whatever has arrived
+# within HISTORY_FLUSH_INTERVAL seconds in one transaction
+HISTORY_FLUSH_INTERVAL = 0.1
+_history_queue = queue.Queue()
+
+
+def _write_history_batch(batch):
+    """Insert a batch of queued symptom records in one commit"""
+    frequencies = Counter()
+    with app.app_context():
+        try:
+            for user_id, severity, symptoms, summary, created_at in batch:
+                db.session.add(SymptomRecord(
+                    user_id=user_id,
+                    severity=severity,
+                    symptoms=symptoms,
+                    recommendations=summary,
+                    created_at=created_at
+                ))
+                frequencies.update((user_id, symptom.lower()) for symptom in symptoms)
+
+            # Keep the per-user symptom counts current in the same transaction
+            if frequencies:
+                insert = sqlite_insert(SymptomFrequency).values([
+                    {'user_id': user_id, 'symptom': symptom, 'count': count}
+                    for (user_id, symptom), count in frequencies.items()
+                ])
+                db.session.execute(insert.on_conflict_do_update(
+                    index_elements=['user_id', 'symptom'],
+                    set_={'count': SymptomFrequency.count + insert.excluded.count}
+                ))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            app.logger.exception('Failed to write %d symptom records', len(batch))
+        finally:
+            db.session.remove()
+
+
+def _history_writer():
+    """Drain the history queue forever, batching writes"""
+    while True:
+        batch = [_history_queue.get()]
+        deadline = time.monotonic() + HISTORY_FLUSH_INTERVAL
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_history_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        _write_history_batch(batch)
+        for _ in batch:
+            _history_queue.task_done()
+
+
+threading.Thread(target=_history_writer, name='history-writer', daemon=True).start()
+
 
 # ==================== Authentication API Routes ====================
 
 @app.route('/api/auth/register', methods=['POST'])
 @handle_validation_error
-@rate_limit(max_requests=10, window_seconds=60)
+@limiter.limit("10 per minute")
 def register():
     """Register a new user"""
     data = request.get_json()
@@ -105,7 +293,7 @@ def register():
 
 @app.route('/api/auth/login', methods=['POST'])
 @handle_validation_error
-@rate_limit(max_requests=20, window_seconds=60)
+@limiter.limit("20 per minute")
 def login():
     """Login user"""
     data = request.get_json()
@@ -127,10 +315,15 @@ def login():
     if not user or not user.check_password(password):
         return jsonify({'error': 'Invalid credentials'}), 401
 
+    # check_password upgrades legacy password hashes in place
+    if db.session.is_modified(user):
+        db.session.commit()
+
     if not user.is_active:
         return jsonify({'error': 'Account is disabled'}), 403
 
     login_user(user, remember=True)
+    _cache_user_in_session(user)
 
     return jsonify({
         'success': True,
@@ -144,16 +337,24 @@ def login():
 def logout():
     """Logout user"""
     logout_user()
+    session.pop('user_dict', None)
     return jsonify({'success': True, 'message': 'Logged out successfully'})
 
 
 @app.route('/api/auth/me', methods=['GET'])
 def get_current_user():
     """Get current user info"""
+    # Fast path: the session already names the user and carries their
+    # profile, so current_user (and its database lookup) is never touched
+    user_dict = session.get('user_dict')
+    if user_dict and str(user_dict.get('id')) == session.get('_user_id'):
+        return jsonify({'authenticated': True, 'user': user_dict})
+
     if current_user.is_authenticated:
+        _cache_user_in_session(current_user)
         return jsonify({
             'authenticated': True,
-            'user': current_user.to_dict()
+            'user': session['user_dict']
         })
     return jsonify({'authenticated': False})
 
@@ -185,18 +386,19 @@ def update_profile():
             current_user.date_of_birth = dob.date()
 
     db.session.commit()
+    _cache_user_in_session(current_user)
 
     return jsonify({
         'success': True,
         'message': 'Profile updated',
-        'user': current_user.to_dict()
+        'user': session['user_dict']
     })
 
 
 # ==================== Symptom API Routes ====================
 
 @app.route('/api/autocomplete', methods=['GET'])
-@rate_limit(max_requests=100, window_seconds=60)
+@limiter.limit("100 per minute")
 def autocomplete():
     """Get symptom suggestions for autocomplete"""
     prefix = Validator.sanitize_string(request.args.get('prefix', ''), 50)
@@ -209,21 +411,21 @@ def autocomplete():
     if not prefix:
         return jsonify({'suggestions': []})
 
+    # The trie memoizes answers per (prefix, max_results)
     suggestions = engine.autocomplete_symptoms(prefix, max_results)
     return jsonify({'suggestions': suggestions})
 
 
 @app.route('/api/symptoms', methods=['GET'])
-@rate_limit(max_requests=50, window_seconds=60)
+@limiter.limit("50 per minute")
 def get_all_symptoms():
     """Get all available symptoms"""
-    symptoms = engine.get_all_symptoms()
-    return jsonify({'symptoms': sorted(symptoms)})
+    return _json_body_response(_SYMPTOMS_JSON, _SYMPTOMS_ETAG)
 
 
 @app.route('/api/analyze', methods=['POST'])
 @handle_validation_error
-@rate_limit(max_requests=30, window_seconds=60)
+@limiter.limit("30 per minute")
 def analyze_symptoms():
     """
     Analyze symptoms and get recommendations
@@ -245,16 +447,12 @@ def analyze_symptoms():
 
     recommendations = engine.get_recommendations(symptoms, severity)
 
-    # Save to database if user is authenticated
+    # Queue a history record if user is authenticated
     if current_user.is_authenticated:
-        record = SymptomRecord(user_id=current_user.id, severity=severity)
-        record.set_symptoms(symptoms)
-        record.set_recommendations({
+        _history_queue.put((current_user.id, severity, symptoms, {
             'remedies_count': len(recommendations.get('remedies', [])),
             'diets_count': len(recommendations.get('diet_plans', []))
-        })
-        db.session.add(record)
-        db.session.commit()
+        }, datetime.utcnow()))
 
     return jsonify({
         'success': True,
@@ -267,7 +465,7 @@ def analyze_symptoms():
 
 
 @app.route('/api/remedy/<remedy_name>', methods=['GET'])
-@rate_limit(max_requests=50, window_seconds=60)
+@limiter.limit("50 per minute")
 def get_remedy(remedy_name):
     """Get details of a specific remedy"""
     remedy_name = Validator.sanitize_string(remedy_name, 200)
@@ -279,7 +477,7 @@ def get_remedy(remedy_name):
 
 
 @app.route('/api/diet/<diet_name>', methods=['GET'])
-@rate_limit(max_requests=50, window_seconds=60)
+@limiter.limit("50 per minute")
 def get_diet(diet_name):
     """Get details of a specific diet plan"""
     diet_name = Validator.sanitize_string(diet_name, 200)
@@ -291,23 +489,22 @@ def get_diet(diet_name):
 
 
 @app.route('/api/remedies', methods=['GET'])
-@rate_limit(max_requests=50, window_seconds=60)
+@limiter.limit("50 per minute")
 def get_all_remedies():
     """Get all available remedies"""
-    remedies = engine.get_all_remedies()
-    return jsonify({'success': True, 'remedies': remedies})
+    return _json_body_response(_REMEDIES_JSON, _REMEDIES_ETAG)
 
 
 @app.route('/api/diets', methods=['GET'])
-@rate_limit(max_requests=50, window_seconds=60)
+@limiter.limit("50 per minute")
 def get_all_diets():
     """Get all available diet plans"""
-    diets = engine.get_all_diet_plans()
-    return jsonify({'success': True, 'diet_plans': diets})
+    return _json_body_response(_DIETS_JSON, _DIETS_ETAG)
 
 
 @app.route('/api/search/ingredient', methods=['GET'])
-@rate_limit(max_requests=50, window_seconds=60)
+@limiter.limit("50 per minute")
+@cache.cached(timeout=60, query_string=True)
 def search_by_ingredient():
     """Search remedies by ingredient"""
     ingredient = Validator.sanitize_string(request.args.get('q', ''), 100)
@@ -320,7 +517,8 @@ def search_by_ingredient():
 
 
 @app.route('/api/search/food', methods=['GET'])
-@rate_limit(max_requests=50, window_seconds=60)
+@limiter.limit("50 per minute")
+@cache.cached(timeout=60, query_string=True)
 def search_by_food():
     """Search diet plans by food"""
     food = Validator.sanitize_string(request.args.get('q', ''), 100)
@@ -345,21 +543,18 @@ def get_history():
 
     # If authenticated, get from database
     if current_user.is_authenticated:
-        records = SymptomRecord.query.filter_by(user_id=current_user.id)\
-            .order_by(SymptomRecord.created_at.desc())\
-            .limit(limit).all()
-
-        history = [record.to_dict() for record in records]
-
-        # Calculate frequency
-        all_records = SymptomRecord.query.filter_by(user_id=current_user.id).all()
-        frequency = {}
-        for record in all_records:
-            for symptom in record.get_symptoms():
-                symptom_lower = symptom.lower()
-                frequency[symptom_lower] = frequency.get(symptom_lower, 0) + 1
+        history = SymptomRecord.query_dicts(
+            SymptomRecord.user_id == current_user.id,
+            order_by=SymptomRecord.created_at.desc(),
+            limit=limit
+        )
 
-        sorted_freq = sorted(frequency.items(), key=lambda x: x[1], reverse=True)
+        # Counts are maintained incrementally by the history writer
+        frequency_rows = db.session.query(SymptomFrequency.symptom, SymptomFrequency.count)\
+            .filter_by(user_id=current_user.id)\
+            .order_by(SymptomFrequency.count.desc())\
+            .all()
+        sorted_freq = [(row.symptom, row.count) for row in frequency_rows]
 
         return jsonify({
             'success': True,
@@ -382,7 +577,7 @@ def get_history():
 
 @app.route('/api/vitals', methods=['POST'])
 @handle_validation_error
-@rate_limit(max_requests=30, window_seconds=60)
+@limiter.limit("30 per minute")
 def record_vitals():
     """Record vital signs measurement"""
     data = request.get_json()
@@ -442,13 +637,15 @@ def get_vitals():
         field_name='limit'
     ) or 50
 
-    records = VitalRecord.query.filter_by(user_id=current_user.id)\
-        .order_by(VitalRecord.measured_at.desc())\
-        .limit(limit).all()
+    vitals = VitalRecord.query_dicts(
+        VitalRecord.user_id == current_user.id,
+        order_by=VitalRecord.measured_at.desc(),
+        limit=limit
+    )
 
     return jsonify({
         'success': True,
-        'vitals': [record.to_dict() for record in records]
+        'vitals': vitals
     })
 
 
@@ -460,7 +657,13 @@ def get_reminders():
     """Get user's reminders"""
     show_completed = request.args.get('completed', 'false').lower() == 'true'
 
-    query = Reminder.query.filter_by(user_id=current_user.id, is_active=True)
+    # Linked remedies/diet plans are fetched in one IN query rather than
+    # one lazy load per reminder when to_dict() touches them (their symptom
+    # links follow the same way through the models' lazy='selectin')
+    query = Reminder.query.options(
+        selectinload(Reminder.remedy),
+        selectinload(Reminder.diet_plan)
+    ).filter_by(user_id=current_user.id, is_active=True)
 
     if not show_completed:
         query = query.filter_by(is_completed=False)
@@ -476,7 +679,7 @@ def get_reminders():
 @app.route('/api/reminders', methods=['POST'])
 @login_required
 @handle_validation_error
-@rate_limit(max_requests=30, window_seconds=60)
+@limiter.limit("30 per minute")
 def create_reminder():
     """Create a new reminder"""
     data = request.get_json()
@@ -484,39 +687,7 @@ def create_reminder():
     if not data:
         return jsonify({'error': 'No data provided'}), 400
 
-    title = Validator.sanitize_string(data.get('title', ''), 200)
-    message = Validator.sanitize_string(data.get('message', ''), 1000)
-
-    if not title:
-        return jsonify({'error': 'Title is required'}), 400
-
-    if not message:
-        return jsonify({'error': 'Message is required'}), 400
-
-    reminder_type = Validator.validate_reminder_type(data.get('reminder_type'))
-    priority = Validator.validate_priority(data.get('priority'))
-
-    scheduled_time = Validator.validate_datetime(
-        data.get('scheduled_time'),
-        'scheduled_time'
-    )
-
-    if not scheduled_time:
-        return jsonify({'error': 'Scheduled time is required'}), 400
-
-    repeat_type = data.get('repeat_type')
-    if repeat_type and repeat_type not in ['none', 'daily', 'weekly', 'monthly']:
-        repeat_type = 'none'
-
-    reminder = Reminder(
-        user_id=current_user.id,
-        title=title,
-        message=message,
-        reminder_type=reminder_type,
-        priority=priority,
-        scheduled_time=scheduled_time,
-        repeat_type=repeat_type
-    )
+    reminder = Reminder(user_id=current_user.id, **Validator.validate_reminder(data))
 
     # Link to remedy or diet if provided
     if data.get('remedy_id'):
@@ -549,31 +720,14 @@ def update_reminder(reminder_id):
 
     data = request.get_json()
 
-    if 'title' in data:
-        reminder.title = Validator.sanitize_string(data['title'], 200)
-
-    if 'message' in data:
-        reminder.message = Validator.sanitize_string(data['message'], 1000)
-
-    if 'reminder_type' in data:
-        reminder.reminder_type = Validator.validate_reminder_type(data['reminder_type'])
-
-    if 'priority' in data:
-        reminder.priority = Validator.validate_priority(data['priority'])
-
-    if 'scheduled_time' in data:
-        reminder.scheduled_time = Validator.validate_datetime(
-            data['scheduled_time'],
-            'scheduled_time'
-        )
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
 
-    if 'is_completed' in data:
-        reminder.is_completed = bool(data['is_completed'])
-        if reminder.is_completed:
-            reminder.completed_at = datetime.utcnow()
+    for field, value in Validator.validate_reminder(data, partial=True).items():
+        setattr(reminder, field, value)
 
-    if 'is_active' in data:
-        reminder.is_active = bool(data['is_active'])
+    if data.get('is_completed'):
+        reminder.completed_at = datetime.utcnow()
 
     db.session.commit()
 
@@ -652,55 +806,137 @@ def complete_reminder(reminder_id):
     })
 
 
+# ==================== Batch API Routes ====================
+
+BULK_MAX_OPS = 10
+
+
+@app.route('/api/bulk', methods=['POST'])
+@handle_validation_error
+@limiter.limit("30 per minute")
+def bulk():
+    """
+    Run several read-only API requests in a single round trip
+
+    Request body:
+    {
+        "ops": [
+            {"path": "/api/auth/me", "method": "GET"},
+            {"path": "/api/reminders"}
+        ]
+    }
+    """
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+
+    ops = data.get('ops')
+
+    if not ops or not isinstance(ops, list):
+        raise ValidationError("ops must be a non-empty list", "ops")
+
+    if len(ops) > BULK_MAX_OPS:
+        raise ValidationError(f"Maximum {BULK_MAX_OPS} operations allowed", "ops")
+
+    # Sub-requests carry the caller's session cookie and share this app
+    # context, so the logged-in user is resolved once for the whole batch
+    headers = {'Cookie': request.headers.get('Cookie', '')}
+    environ_base = {'REMOTE_ADDR': request.remote_addr}
+
+    results = []
+    for op in ops:
+        path = op.get('path') if isinstance(op, dict) else None
+        method = (op.get('method') or 'GET') if isinstance(op, dict) else None
+        # A non-string method (e.g. 5) is rejected per op like a bad path
+        method = method.upper() if isinstance(method, str) else None
+
+        if (not isinstance(path, str) or method != 'GET'
+                or not path.startswith('/api/') or path.startswith('/api/bulk')):
+            results.append({
+                'path': path,
+                'status': 400,
+                'body': {'error': 'Only GET requests to /api/ endpoints can be batched'}
+            })
+            continue
+
+        with app.test_request_context(path, method='GET', headers=headers,
+                                      environ_base=environ_base):
+            response = app.full_dispatch_request()
+
+        results.append({
+            'path': path,
+            'status': response.status_code,
+            'body': response.get_json(silent=True)
+        })
+
+    return jsonify({'success': True, 'results': results})
+
+
 # ==================== Frontend Routes ====================
 
+# The page templates contain no template logic, so each is rendered once
+# here and the HTML string reused for every request
+_STATIC_PAGES = ('index.html', 'remedies.html', 'diet_plans.html', 'vitals.html',
+                 'history.html', 'login.html', 'register.html', 'reminders.html')
+with app.app_context():
+    _PAGE_CACHE = {name: render_template(name) for name in _STATIC_PAGES}
+
+
+def _static_page(name):
+    """Return a pre-rendered page, re-rendering when templates auto-reload"""
+    if app.jinja_env.auto_reload:
+        return render_template(name)
+    return _PAGE_CACHE[name]
+
+
 @app.route('/')
 def index():
     """Serve the main page"""
-    return render_template('index.html')
+    return _static_page('index.html')
 
 
 @app.route('/remedies')
 def remedies_page():
     """Serve the remedies page"""
-    return render_template('remedies.html')
+    return _static_page('remedies.html')
 
 
 @app.route('/diet-plans')
 def diet_plans_page():
     """Serve the diet plans page"""
-    return render_template('diet_plans.html')
+    return _static_page('diet_plans.html')
 
 
 @app.route('/vitals')
 def vitals_page():
     """Serve the vitals monitoring page"""
-    return render_template('vitals.html')
+    return _static_page('vitals.html')
 
 
 @app.route('/history')
 def history_page():
     """Serve the history page"""
-    return render_template('history.html')
+    return _static_page('history.html')
 
 
 @app.route('/login')
 def login_page():
     """Serve the login page"""
-    return render_template('login.html')
+    return _static_page('login.html')
 
 
 @app.route('/register')
 def register_page():
     """Serve the registration page"""
-    return render_template('register.html')
+    return _static_page('register.html')
 
 
 @app.route('/reminders')
 @login_required
 def reminders_page():
     """Serve the reminders page"""
-    return render_template('reminders.html')
+    return _static_page('reminders.html')
 
 
 @app.route('/profile')
@@ -724,7 +960,7 @@ def handle_validation_error_global(error):
 def not_found(error):
     if request.path.startswith('/api/'):
         return jsonify({'error': 'Endpoint not found'}), 404
-    return render_template('index.html')
+    return _static_page('index.html')
 
 
 @app.errorhandler(500)
@@ -3,18 +3,21 @@ Data Structures Module for Smart Health Management System
 """
 
 from .hash_table import HashTable, SymptomHashTable
-from .trie import Trie, SymptomTrie
-from .bst import BinarySearchTree, RecommendationBST
-from .graph import Graph, HealthGraph
+from .trie import Trie, FrozenTrie, SymptomTrie
+from .bst import BinarySearchTree, BST, RecommendationBST
+from .graph import Edge, Graph, HealthGraph
 from .queue import Queue, PriorityQueue, ReminderQueue, SymptomHistoryQueue
 
 __all__ = [
     'HashTable',
     'SymptomHashTable',
     'Trie',
+    'FrozenTrie',
     'SymptomTrie',
     'BinarySearchTree',
+    'BST',
     'RecommendationBST',
+    'Edge',
     'Graph',
     'HealthGraph',
     'Queue',
@@ -0,0 +1,107 @@
+"""
+Numba kernels for the frozen (CSR) HealthGraph
+Optional: when Numba is not installed AVAILABLE is False and the graph
+keeps using its NumPy / pure-Python paths
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    AVAILABLE = True
+except ImportError:
+    AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in decorator so the kernels below still define"""
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True)
+def bfs_csr(indptr, indices, start):
+    """Breadth-first visit order from start, using a ring-buffer frontier"""
+    n_nodes = indptr.shape[0] - 1
+    visited = np.zeros(n_nodes, dtype=np.uint8)
+    frontier = np.empty(n_nodes, dtype=np.int64)
+    order = np.empty(n_nodes, dtype=np.int64)
+
+    head = 0
+    tail = 0
+    count = 0
+    frontier[tail] = start
+    tail += 1
+    visited[start] = 1
+
+    while head != tail:
+        node = frontier[head % n_nodes]
+        head += 1
+        order[count] = node
+        count += 1
+        for i in range(indptr[node], indptr[node + 1]):
+            neighbor = indices[i]
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                frontier[tail % n_nodes] = neighbor
+                tail += 1
+
+    return order[:count]
+
+
+@njit(cache=True)
+def dfs_csr(indptr, indices, start):
+    """Depth-first visit order from start (same order as Graph.dfs)"""
+    n_nodes = indptr.shape[0] - 1
+    visited = np.zeros(n_nodes, dtype=np.uint8)
+    stack = np.empty(indices.shape[0] + 1, dtype=np.int64)
+    order = np.empty(n_nodes, dtype=np.int64)
+
+    top = 0
+    count = 0
+    stack[top] = start
+    top += 1
+
+    while top > 0:
+        top -= 1
+        node = stack[top]
+        if visited[node]:
+            continue
+        visited[node] = 1
+        order[count] = node
+        count += 1
+        # Push in reverse so neighbors are visited in adjacency order
+        for i in range(indptr[node + 1] - 1, indptr[node] - 1, -1):
+            neighbor = indices[i]
+            if not visited[neighbor]:
+                stack[top] = neighbor
+                top += 1
+
+    return order[:count]
+
+
+@njit(cache=True)
+def score_csr(indptr, indices, weights, rows, n_targets):
+    """
+    Accumulate match counts and scores over the given CSR rows
+
+    Returns:
+        (counts, scores, first_seen) per target; first_seen is the position
+        of a target's first edge in the walk, or -1 if it was not reached
+    """
+    counts = np.zeros(n_targets, dtype=np.int64)
+    scores = np.zeros(n_targets, dtype=weights.dtype)
+    first_seen = np.full(n_targets, -1, dtype=np.int64)
+
+    position = 0
+    for r in range(rows.shape[0]):
+        row = rows[r]
+        for i in range(indptr[row], indptr[row + 1]):
+            target = indices[i]
+            if first_seen[target] < 0:
+                first_seen[target] = position
+            counts[target] += 1
+            scores[target] += weights[i]
+            position += 1
+
+    return counts, scores, first_seen
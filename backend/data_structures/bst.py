@@ -1,14 +1,26 @@
 """
 Binary Search Tree Implementation for Sorted Recommendations
 Used for organizing diet plans and remedies by effectiveness/priority
+
+The tree is kept height-balanced (AVL) so lookups and ordered walks stay
+O(log n) even when scores are inserted in sorted order.
 """
 
+from itertools import islice
+
+
 class BSTNode:
     def __init__(self, key, data=None):
         self.key = key  # Priority/effectiveness score
         self.data = data  # Remedy or diet plan data
         self.left = None
         self.right = None
+        self.height = 1  # Height of the subtree rooted here
+
+
+def _height(node):
+    """Height of a possibly empty subtree"""
+    return node.height if node else 0
 
 
 class BinarySearchTree:
@@ -18,27 +30,60 @@ class BinarySearchTree:
 
     def insert(self, key, data=None):
         """Insert a node with given key and data"""
-        new_node = BSTNode(key, data)
+        self.root = self._insert_helper(self.root, key, data)
+        self.size += 1
 
-        if self.root is None:
-            self.root = new_node
-            self.size += 1
-            return
+    def _insert_helper(self, node, key, data):
+        """Helper for insertion; returns the rebalanced subtree root"""
+        if node is None:
+            return BSTNode(key, data)
 
-        current = self.root
-        while True:
-            if key <= current.key:
-                if current.left is None:
-                    current.left = new_node
-                    self.size += 1
-                    return
-                current = current.left
-            else:
-                if current.right is None:
-                    current.right = new_node
-                    self.size += 1
-                    return
-                current = current.right
+        # Equal keys go left, so among equal keys the earliest inserted
+        # comes first in descending order (rotations preserve this)
+        if key <= node.key:
+            node.left = self._insert_helper(node.left, key, data)
+        else:
+            node.right = self._insert_helper(node.right, key, data)
+
+        return self._rebalance(node)
+
+    def _update_height(self, node):
+        node.height = 1 + max(_height(node.left), _height(node.right))
+
+    def _rotate_left(self, node):
+        """Rotate left around node; returns the new subtree root"""
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update_height(node)
+        self._update_height(pivot)
+        return pivot
+
+    def _rotate_right(self, node):
+        """Rotate right around node; returns the new subtree root"""
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update_height(node)
+        self._update_height(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        """Restore the AVL invariant at node after a child changed"""
+        self._update_height(node)
+        balance = _height(node.left) - _height(node.right)
+
+        if balance > 1:
+            if _height(node.left.left) < _height(node.left.right):
+                node.left = self._rotate_left(node.left)  # Left-right case
+            return self._rotate_right(node)
+
+        if balance < -1:
+            if _height(node.right.right) < _height(node.right.left):
+                node.right = self._rotate_right(node.right)  # Right-left case
+            return self._rotate_left(node)
+
+        return node
 
     def search(self, key):
         """Search for a node with given key"""
@@ -52,56 +97,59 @@ class BinarySearchTree:
                 current = current.right
         return None
 
+    def _iter_asc(self, min_key=None, max_key=None):
+        """Yield (key, data) in ascending order, optionally within a range"""
+        # Explicit stack instead of recursion: no Python frame per node and
+        # callers that stop early never visit the rest of the tree
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                # Left subtree keys are <= node.key; skip it when too small
+                node = node.left if min_key is None or min_key <= node.key else None
+            node = stack.pop()
+            if max_key is not None and node.key > max_key:
+                return
+            if min_key is None or node.key >= min_key:
+                yield (node.key, node.data)
+            node = node.right
+
+    def _iter_desc(self, min_key=None, max_key=None):
+        """Yield (key, data) in descending order, optionally within a range"""
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                # Right subtree keys are >= node.key; skip it when too large
+                node = node.right if max_key is None or node.key <= max_key else None
+            node = stack.pop()
+            if min_key is not None and node.key < min_key:
+                return
+            if max_key is None or node.key <= max_key:
+                yield (node.key, node.data)
+            node = node.left
+
     def inorder_traversal(self):
         """Return items sorted by key (ascending order)"""
-        result = []
-        self._inorder_helper(self.root, result)
-        return result
-
-    def _inorder_helper(self, node, result):
-        """Helper for inorder traversal"""
-        if node:
-            self._inorder_helper(node.left, result)
-            result.append((node.key, node.data))
-            self._inorder_helper(node.right, result)
+        return list(self._iter_asc())
 
     def reverse_inorder_traversal(self):
         """Return items sorted by key (descending order - highest priority first)"""
-        result = []
-        self._reverse_inorder_helper(self.root, result)
-        return result
-
-    def _reverse_inorder_helper(self, node, result):
-        """Helper for reverse inorder traversal"""
-        if node:
-            self._reverse_inorder_helper(node.right, result)
-            result.append((node.key, node.data))
-            self._reverse_inorder_helper(node.left, result)
+        return list(self._iter_desc())
 
     def get_top_n(self, n):
         """Get top N items by priority (highest first)"""
-        items = self.reverse_inorder_traversal()
-        return items[:n]
+        return list(islice(self._iter_desc(), n))
 
     def get_in_range(self, min_key, max_key):
         """Get all items within a key range"""
-        result = []
-        self._range_helper(self.root, min_key, max_key, result)
-        return result
-
-    def _range_helper(self, node, min_key, max_key, result):
-        """Helper for range query"""
-        if node is None:
-            return
-
-        if min_key < node.key:
-            self._range_helper(node.left, min_key, max_key, result)
-
-        if min_key <= node.key <= max_key:
-            result.append((node.key, node.data))
+        return list(self._iter_asc(min_key, max_key))
 
-        if node.key < max_key:
-            self._range_helper(node.right, min_key, max_key, result)
+    def get_in_range_desc(self, min_key, max_key):
+        """Get all items within a key range, highest key first"""
+        return list(self._iter_desc(min_key, max_key))
 
     def find_min(self):
         """Find the minimum key in the tree"""
@@ -151,17 +199,20 @@ class BinarySearchTree:
                 return node.left
 
             # Case 3: Two children
-            # Find inorder successor (smallest in right subtree)
-            successor = node.right
-            while successor.left:
-                successor = successor.left
-
+            # Splice out the inorder successor (smallest in right subtree)
+            # in a single walk and move its key/data into this node
+            node.right, successor = self._remove_min(node.right)
             node.key = successor.key
             node.data = successor.data
-            node.right = self._delete_helper(node.right, successor.key)
-            self.size += 1  # Undo the decrement since we're replacing, not removing
 
-        return node
+        return self._rebalance(node)
+
+    def _remove_min(self, node):
+        """Unlink the leftmost node of a subtree; returns (new subtree, removed node)"""
+        if node.left is None:
+            return node.right, node
+        node.left, minimum = self._remove_min(node.left)
+        return self._rebalance(node), minimum
 
     def __len__(self):
         return self.size
@@ -169,6 +220,14 @@ class BinarySearchTree:
     def is_empty(self):
         return self.root is None
 
+    def height(self):
+        """Height of the tree (0 when empty)"""
+        return _height(self.root)
+
+
+# Short alias
+BST = BinarySearchTree
+
 
 # Specialized BST for Recommendations
 class RecommendationBST(BinarySearchTree):
@@ -186,9 +245,8 @@ class RecommendationBST(BinarySearchTree):
 
     def get_recommendations_by_severity(self, min_severity, max_severity):
         """Get recommendations suitable for a severity range"""
-        items = self.get_in_range(min_severity, max_severity)
-        # Sort by effectiveness descending
-        items.sort(key=lambda x: x[0], reverse=True)
+        # Walked in descending order, so no re-sort is needed
+        items = self.get_in_range_desc(min_severity, max_severity)
         return [data for score, data in items]
 
     def get_all_sorted(self):
@@ -3,7 +3,39 @@ Graph Implementation for Symptom-Remedy Relationships
 Used for mapping connections between symptoms, diet plans, and remedies
 """
 
-from collections import deque
+import heapq
+from collections import defaultdict, deque
+from types import MappingProxyType
+
+try:
+    import numpy as np
+except ImportError:  # Optional: HealthGraph.freeze() is a no-op without it
+    np = None
+
+if np is not None:
+    from . import _graph_numba
+else:
+    _graph_numba = None
+
+
+class Edge:
+    """A weighted, typed edge to a neighbor node"""
+    __slots__ = ('node', 'weight', 'type')
+
+    def __init__(self, node, weight=1, relationship_type=None):
+        self.node = node
+        self.weight = weight
+        self.type = relationship_type
+
+    def __getitem__(self, field):
+        # Edges used to be dicts; keep edge.node style access working
+        try:
+            return getattr(self, field)
+        except AttributeError:
+            raise KeyError(field) from None
+
+    def __repr__(self):
+        return f"Edge({self.node!r}, weight={self.weight!r}, type={self.type!r})"
 
 
 class Graph:
@@ -11,12 +43,19 @@ class Graph:
         self.adjacency_list = {}
         self.directed = directed
         self.node_data = {}  # Store additional data for each node
+        # Successor and predecessor sets alongside the ordered edge lists,
+        # for O(1) has_edge and removals that only touch affected nodes
+        self._neighbor_set = {}
+        self._rev = {}
 
     def add_node(self, node, data=None):
         """Add a node to the graph"""
         if node not in self.adjacency_list:
             self.adjacency_list[node] = []
             self.node_data[node] = data
+            self._neighbor_set[node] = set()
+            self._rev[node] = set()
+            self._on_mutate()
 
     def add_edge(self, node1, node2, weight=1, relationship_type=None):
         """Add an edge between two nodes"""
@@ -27,20 +66,23 @@ class Graph:
             self.add_node(node2)
 
         # Add edge with weight and relationship type
-        edge_data = {
-            'node': node2,
-            'weight': weight,
-            'type': relationship_type
-        }
-        self.adjacency_list[node1].append(edge_data)
+        self._insert_edge(self.adjacency_list[node1], Edge(node2, weight, relationship_type))
+        self._neighbor_set[node1].add(node2)
+        self._rev[node2].add(node1)
 
         if not self.directed:
-            reverse_edge = {
-                'node': node1,
-                'weight': weight,
-                'type': relationship_type
-            }
-            self.adjacency_list[node2].append(reverse_edge)
+            self._insert_edge(self.adjacency_list[node2], Edge(node1, weight, relationship_type))
+            self._neighbor_set[node2].add(node1)
+            self._rev[node1].add(node2)
+
+        self._on_mutate()
+
+    def _insert_edge(self, edges, edge):
+        """Place a new edge in a node's edge list (appended by default)"""
+        edges.append(edge)
+
+    def _on_mutate(self):
+        """Called after any change to nodes or edges; subclasses drop caches here"""
 
     def get_neighbors(self, node):
         """Get all neighbors of a node"""
@@ -58,9 +100,7 @@ class Graph:
 
     def has_edge(self, node1, node2):
         """Check if edge exists between two nodes"""
-        if node1 not in self.adjacency_list:
-            return False
-        return any(edge['node'] == node2 for edge in self.adjacency_list[node1])
+        return node2 in self._neighbor_set.get(node1, ())
 
     def bfs(self, start_node):
         """Breadth-first search traversal"""
@@ -77,8 +117,8 @@ class Graph:
                 visited.add(node)
                 result.append(node)
                 for edge in self.adjacency_list[node]:
-                    if edge['node'] not in visited:
-                        queue.append(edge['node'])
+                    if edge.node not in visited:
+                        queue.append(edge.node)
 
         return result
 
@@ -89,35 +129,47 @@ class Graph:
 
         visited = set()
         result = []
-        self._dfs_helper(start_node, visited, result)
-        return result
+        stack = [start_node]
+
+        # Explicit stack instead of recursion (no RecursionError on deep
+        # graphs). Neighbors are pushed in reverse so they are visited in
+        # adjacency order, giving the same order as the recursive walk.
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            result.append(node)
+            stack.extend(
+                edge.node for edge in reversed(self.adjacency_list[node])
+                if edge.node not in visited
+            )
 
-    def _dfs_helper(self, node, visited, result):
-        """Helper for DFS"""
-        visited.add(node)
-        result.append(node)
-        for edge in self.adjacency_list[node]:
-            if edge['node'] not in visited:
-                self._dfs_helper(edge['node'], visited, result)
+        return result
 
     def find_path(self, start, end):
         """Find a path between two nodes using BFS"""
         if start not in self.adjacency_list or end not in self.adjacency_list:
             return None
 
-        visited = set()
-        queue = deque([(start, [start])])
+        # Record each node's BFS parent instead of copying a path per edge;
+        # the path is rebuilt once when end is reached
+        parent = {start: None}
+        queue = deque([start])
 
         while queue:
-            node, path = queue.popleft()
+            node = queue.popleft()
             if node == end:
-                return path
+                path = [node]
+                while node != start:
+                    node = parent[node]
+                    path.append(node)
+                return path[::-1]
 
-            if node not in visited:
-                visited.add(node)
-                for edge in self.adjacency_list[node]:
-                    if edge['node'] not in visited:
-                        queue.append((edge['node'], path + [edge['node']]))
+            for edge in self.adjacency_list[node]:
+                if edge.node not in parent:
+                    parent[edge.node] = node
+                    queue.append(edge.node)
 
         return None
 
@@ -141,33 +193,53 @@ class Graph:
         if node not in self.adjacency_list:
             return False
 
-        # Remove edges pointing to this node
-        for other_node in self.adjacency_list:
+        # Remove edges pointing to this node (only predecessors have any)
+        for other_node in self._rev[node]:
             self.adjacency_list[other_node] = [
                 edge for edge in self.adjacency_list[other_node]
-                if edge['node'] != node
+                if edge.node != node
             ]
+            self._neighbor_set[other_node].discard(node)
+
+        for other_node in self._neighbor_set[node]:
+            self._rev[other_node].discard(node)
 
         # Remove the node itself
         del self.adjacency_list[node]
+        del self._neighbor_set[node]
+        del self._rev[node]
         if node in self.node_data:
             del self.node_data[node]
 
+        self._on_mutate()
         return True
 
     def remove_edge(self, node1, node2):
         """Remove an edge between two nodes"""
-        if node1 in self.adjacency_list:
+        if self.has_edge(node1, node2):
             self.adjacency_list[node1] = [
                 edge for edge in self.adjacency_list[node1]
-                if edge['node'] != node2
+                if edge.node != node2
             ]
+            self._neighbor_set[node1].discard(node2)
+            self._rev[node2].discard(node1)
 
-        if not self.directed and node2 in self.adjacency_list:
+        if not self.directed and self.has_edge(node2, node1):
             self.adjacency_list[node2] = [
                 edge for edge in self.adjacency_list[node2]
-                if edge['node'] != node1
+                if edge.node != node1
             ]
+            self._neighbor_set[node2].discard(node1)
+            self._rev[node1].discard(node2)
+
+        self._on_mutate()
+
+
+# Node kinds in HealthGraph, keyed by the node-name prefix
+KIND_SYMPTOM = 0
+KIND_REMEDY = 1
+KIND_DIET = 2
+_KIND_BY_PREFIX = {'symptom': KIND_SYMPTOM, 'remedy': KIND_REMEDY, 'diet': KIND_DIET}
 
 
 # Specialized Graph for Health Relationships
@@ -177,27 +249,254 @@ class HealthGraph(Graph):
         self.symptoms = set()
         self.remedies = set()
         self.diet_plans = set()
+        # Kind and display name per node key, so lookups compare ints
+        # instead of scanning and slicing "remedy:"-style prefixes
+        self._node_kind = {}
+        self._node_name = {}
+        # CSR snapshot of symptom -> remedy/diet edges, built by freeze()
+        self._csr = None
+        # Per-symptom query results, valid until the graph next changes
+        self._remedy_cache = {}
+        self._diet_cache = {}
+        self._related_cache = {}
+
+    @staticmethod
+    def _key(prefix, name):
+        """Node key for a name; keys are case-insensitive"""
+        return f"{prefix}:{name.lower()}"
+
+    def add_node(self, node, data=None):
+        """Add a node, recording its kind and display name"""
+        if node not in self._node_kind:
+            prefix, sep, name = node.partition(':')
+            self._node_kind[node] = _KIND_BY_PREFIX.get(prefix) if sep else None
+            self._node_name.setdefault(node, name if sep else node)
+        super().add_node(node, data)
+
+    def _add_named_node(self, prefix, name, data=None):
+        """Add a node for a display name; returns its key"""
+        key = self._key(prefix, name)
+        self._node_name.setdefault(key, name)
+        self.add_node(key, data)
+        return key
+
+    def remove_node(self, node):
+        """Remove a node and all its edges"""
+        removed = super().remove_node(node)
+        if removed:
+            self._node_kind.pop(node, None)
+            self._node_name.pop(node, None)
+        return removed
+
+    def _insert_edge(self, edges, edge):
+        """Keep each edge list sorted by weight, highest first"""
+        # Binary search for the slot after every edge of equal or higher
+        # weight, so equal weights keep insertion order (like a stable sort)
+        lo, hi = 0, len(edges)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if edges[mid].weight < edge.weight:
+                hi = mid
+            else:
+                lo = mid + 1
+        edges.insert(lo, edge)
+
+    def _on_mutate(self):
+        self._csr = None
+        self._remedy_cache.clear()
+        self._diet_cache.clear()
+        self._related_cache.clear()
+
+    def freeze(self):
+        """
+        Snapshot symptom -> remedy/diet edges into NumPy CSR arrays
+
+        While frozen, get_recommendations_for_symptoms aggregates scores
+        with vectorized bincounts instead of per-edge dict updates. With
+        Numba installed, scoring, bfs and dfs run as compiled kernels over
+        the arrays. Any later change to the graph drops the snapshot.
+
+        Returns:
+            True if the snapshot was built (False when NumPy is missing)
+        """
+        if np is None:
+            return False
+        csr = {
+            'remedies': self._build_csr(KIND_REMEDY),
+            'diet_plans': self._build_csr(KIND_DIET)
+        }
+
+        if _graph_numba.AVAILABLE:
+            csr['adjacency'] = self._build_adjacency_csr()
+            # Compile (or load cached) kernels now rather than on the
+            # first request
+            adjacency = csr['adjacency']
+            if adjacency['nodes']:
+                _graph_numba.bfs_csr(adjacency['indptr'], adjacency['indices'], 0)
+                _graph_numba.dfs_csr(adjacency['indptr'], adjacency['indices'], 0)
+            for target in (csr['remedies'], csr['diet_plans']):
+                _graph_numba.score_csr(target['indptr'], target['indices'], target['weights'],
+                                       np.empty(0, dtype=np.int64), len(target['names']))
+
+        self._csr = csr
+        return True
+
+    def is_frozen(self):
+        return self._csr is not None
+
+    def _build_csr(self, kind):
+        """Build CSR arrays for edges from symptom nodes to nodes of a kind"""
+        rows = {}
+        target_ids = {}
+        names = []
+        data = []
+        indptr = [0]
+        indices = []
+        weights = []
+
+        node_kind = self._node_kind
+        for node, edges in self.adjacency_list.items():
+            if node_kind[node] != KIND_SYMPTOM:
+                continue
+            # Edge lists are already sorted by weight, the same per-symptom
+            # order get_remedies_for_symptom uses, so ties resolve
+            # identically to the dict-based aggregation
+            targets = [edge for edge in edges if node_kind[edge.node] == kind]
+            for edge in targets:
+                if edge.node not in target_ids:
+                    target_ids[edge.node] = len(names)
+                    names.append(self._node_name[edge.node])
+                    data.append(self.get_node_data(edge.node))
+                indices.append(target_ids[edge.node])
+                weights.append(edge.weight)
+            rows[node] = len(indptr) - 1
+            indptr.append(len(indices))
+
+        # Integer weights stay integers so scores match the Python path
+        all_int = all(isinstance(w, int) for w in weights)
+        return {
+            'rows': rows,
+            'names': names,
+            'data': data,
+            'indptr': np.array(indptr, dtype=np.int64),
+            'indices': np.array(indices, dtype=np.int64),
+            'weights': np.array(weights, dtype=np.int64 if all_int else np.float64)
+        }
+
+    def _build_adjacency_csr(self):
+        """CSR arrays of every edge, for the compiled traversal kernels"""
+        node_ids = {node: i for i, node in enumerate(self.adjacency_list)}
+        indptr = [0]
+        indices = []
+        for edges in self.adjacency_list.values():
+            indices.extend(node_ids[edge.node] for edge in edges)
+            indptr.append(len(indices))
+        return {
+            'node_ids': node_ids,
+            'nodes': list(self.adjacency_list),
+            'indptr': np.array(indptr, dtype=np.int64),
+            'indices': np.array(indices, dtype=np.int64)
+        }
+
+    def _traverse_csr(self, kernel, start_node):
+        """Run a compiled traversal kernel; None when not frozen with Numba"""
+        if self._csr is None or 'adjacency' not in self._csr:
+            return None
+        adjacency = self._csr['adjacency']
+        start = adjacency['node_ids'].get(start_node)
+        if start is None:
+            return []
+        nodes = adjacency['nodes']
+        return [nodes[i] for i in kernel(adjacency['indptr'], adjacency['indices'], start).tolist()]
+
+    def bfs(self, start_node):
+        """Breadth-first search traversal"""
+        result = self._traverse_csr(_graph_numba.bfs_csr if _graph_numba else None, start_node)
+        return super().bfs(start_node) if result is None else result
+
+    def dfs(self, start_node):
+        """Depth-first search traversal"""
+        result = self._traverse_csr(_graph_numba.dfs_csr if _graph_numba else None, start_node)
+        return super().dfs(start_node) if result is None else result
+
+    def _aggregate_csr(self, csr, symptoms, top_k=None):
+        """Score and rank one target kind for the given symptoms"""
+        indptr, indices, weights = csr['indptr'], csr['indices'], csr['weights']
+
+        if _graph_numba.AVAILABLE:
+            rows = np.array(
+                [row for row in (csr['rows'].get(self._key("symptom", symptom)) for symptom in symptoms)
+                 if row is not None],
+                dtype=np.int64
+            )
+            counts, scores, first_seen = _graph_numba.score_csr(
+                indptr, indices, weights, rows, len(csr['names'])
+            )
+            hit_ids = np.flatnonzero(first_seen >= 0)
+            return self._rank_csr(csr, hit_ids, first_seen[hit_ids], counts, scores, top_k)
+
+        slices = [
+            slice(indptr[row], indptr[row + 1])
+            for row in (csr['rows'].get(self._key("symptom", symptom)) for symptom in symptoms)
+            if row is not None
+        ]
+        if not slices:
+            return []
+
+        ids = np.concatenate([indices[sl] for sl in slices])
+        if ids.size == 0:
+            return []
+        edge_weights = np.concatenate([weights[sl] for sl in slices])
+
+        size = len(csr['names'])
+        counts = np.bincount(ids, minlength=size)
+        scores = np.bincount(ids, weights=edge_weights, minlength=size)
+        if weights.dtype.kind == 'i':
+            scores = scores.astype(np.int64)
+
+        hit_ids, first_seen = np.unique(ids, return_index=True)
+        return self._rank_csr(csr, hit_ids, first_seen, counts, scores, top_k)
+
+    def _rank_csr(self, csr, hit_ids, first_seen, counts, scores, top_k=None):
+        """Order reached targets by (matches, score) and build result dicts"""
+        # First appearance breaks (matches, score) ties, as the stable sort
+        # over insertion-ordered dicts does in the Python path
+        order = np.lexsort((first_seen, -scores[hit_ids], -counts[hit_ids]))
+        # Result dicts are only built for the targets that are returned
+        ranked = hit_ids[order[:top_k]].tolist()
+        score_list = scores.tolist()
+        count_list = counts.tolist()
+
+        return [
+            {
+                'name': csr['names'][i],
+                'score': score_list[i],
+                'matches': count_list[i],
+                'data': csr['data'][i]
+            }
+            for i in ranked
+        ]
 
     def add_symptom(self, symptom, data=None):
         """Add a symptom node"""
-        self.add_node(f"symptom:{symptom}", data)
+        self._add_named_node("symptom", symptom, data)
         self.symptoms.add(symptom)
 
     def add_remedy(self, remedy, data=None):
         """Add a remedy node"""
-        self.add_node(f"remedy:{remedy}", data)
+        self._add_named_node("remedy", remedy, data)
         self.remedies.add(remedy)
 
     def add_diet_plan(self, diet_plan, data=None):
         """Add a diet plan node"""
-        self.add_node(f"diet:{diet_plan}", data)
+        self._add_named_node("diet", diet_plan, data)
         self.diet_plans.add(diet_plan)
 
     def link_symptom_to_remedy(self, symptom, remedy, effectiveness=1):
         """Create a relationship between symptom and remedy"""
         self.add_edge(
-            f"symptom:{symptom}",
-            f"remedy:{remedy}",
+            self._add_named_node("symptom", symptom),
+            self._add_named_node("remedy", remedy),
             weight=effectiveness,
             relationship_type="treats"
         )
@@ -205,137 +504,151 @@ class HealthGraph(Graph):
     def link_symptom_to_diet(self, symptom, diet_plan, effectiveness=1):
         """Create a relationship between symptom and diet plan"""
         self.add_edge(
-            f"symptom:{symptom}",
-            f"diet:{diet_plan}",
+            self._add_named_node("symptom", symptom),
+            self._add_named_node("diet", diet_plan),
             weight=effectiveness,
             relationship_type="helps"
         )
 
     def link_related_symptoms(self, symptom1, symptom2, strength=1):
         """Link two related symptoms"""
+        node1 = self._add_named_node("symptom", symptom1)
+        node2 = self._add_named_node("symptom", symptom2)
         self.add_edge(
-            f"symptom:{symptom1}",
-            f"symptom:{symptom2}",
+            node1,
+            node2,
             weight=strength,
             relationship_type="related"
         )
         self.add_edge(
-            f"symptom:{symptom2}",
-            f"symptom:{symptom1}",
+            node2,
+            node1,
             weight=strength,
             relationship_type="related"
         )
 
     def get_remedies_for_symptom(self, symptom):
-        """Get all remedies for a symptom"""
-        symptom_node = f"symptom:{symptom}"
+        """Get all remedies for a symptom (memoized; a tuple of read-only mappings)"""
+        cached = self._remedy_cache.get(symptom)
+        if cached is not None:
+            return cached
+
+        symptom_node = self._key("symptom", symptom)
         if not self.has_node(symptom_node):
-            return []
+            self._remedy_cache[symptom] = ()
+            return ()
 
+        node_kind = self._node_kind
         remedies = []
         for edge in self.get_neighbors(symptom_node):
-            if edge['node'].startswith("remedy:"):
-                remedy_name = edge['node'].replace("remedy:", "")
-                remedies.append({
-                    'name': remedy_name,
-                    'effectiveness': edge['weight'],
-                    'data': self.get_node_data(edge['node'])
-                })
-
-        # Sort by effectiveness
-        remedies.sort(key=lambda x: x['effectiveness'], reverse=True)
-        return remedies
+            if node_kind[edge.node] == KIND_REMEDY:
+                remedies.append(MappingProxyType({
+                    'name': self._node_name[edge.node],
+                    'effectiveness': edge.weight,
+                    'data': self.get_node_data(edge.node)
+                }))
+
+        # Already in effectiveness order: edge lists are kept sorted by weight
+        result = self._remedy_cache[symptom] = tuple(remedies)
+        return result
 
     def get_diet_plans_for_symptom(self, symptom):
-        """Get all diet plans for a symptom"""
-        symptom_node = f"symptom:{symptom}"
+        """Get all diet plans for a symptom (memoized; a tuple of read-only mappings)"""
+        cached = self._diet_cache.get(symptom)
+        if cached is not None:
+            return cached
+
+        symptom_node = self._key("symptom", symptom)
         if not self.has_node(symptom_node):
-            return []
+            self._diet_cache[symptom] = ()
+            return ()
 
+        node_kind = self._node_kind
         diet_plans = []
         for edge in self.get_neighbors(symptom_node):
-            if edge['node'].startswith("diet:"):
-                diet_name = edge['node'].replace("diet:", "")
-                diet_plans.append({
-                    'name': diet_name,
-                    'effectiveness': edge['weight'],
-                    'data': self.get_node_data(edge['node'])
-                })
-
-        diet_plans.sort(key=lambda x: x['effectiveness'], reverse=True)
-        return diet_plans
+            if node_kind[edge.node] == KIND_DIET:
+                diet_plans.append(MappingProxyType({
+                    'name': self._node_name[edge.node],
+                    'effectiveness': edge.weight,
+                    'data': self.get_node_data(edge.node)
+                }))
+
+        result = self._diet_cache[symptom] = tuple(diet_plans)
+        return result
 
     def get_related_symptoms(self, symptom):
-        """Get symptoms related to a given symptom"""
-        symptom_node = f"symptom:{symptom}"
+        """Get symptoms related to a given symptom (memoized; a tuple of read-only mappings)"""
+        cached = self._related_cache.get(symptom)
+        if cached is not None:
+            return cached
+
+        symptom_node = self._key("symptom", symptom)
         if not self.has_node(symptom_node):
-            return []
+            self._related_cache[symptom] = ()
+            return ()
 
+        node_kind = self._node_kind
         related = []
         for edge in self.get_neighbors(symptom_node):
-            if edge['node'].startswith("symptom:") and edge['type'] == 'related':
-                related_symptom = edge['node'].replace("symptom:", "")
-                related.append({
-                    'symptom': related_symptom,
-                    'strength': edge['weight']
-                })
+            if node_kind[edge.node] == KIND_SYMPTOM and edge.type == 'related':
+                related.append(MappingProxyType({
+                    'symptom': self._node_name[edge.node],
+                    'strength': edge.weight
+                }))
 
-        return related
+        result = self._related_cache[symptom] = tuple(related)
+        return result
 
-    def get_recommendations_for_symptoms(self, symptoms):
-        """Get combined recommendations for multiple symptoms"""
-        remedies_scores = {}
-        diet_scores = {}
+    def get_recommendations_for_symptoms(self, symptoms, top_k=None):
+        """
+        Get combined recommendations for multiple symptoms
+
+        Args:
+            symptoms: Symptom names
+            top_k: Only return the k best remedies and diet plans
+
+        Returns:
+            Dict of 'remedies' and 'diet_plans', ranked by matches then score
+        """
+        if self._csr is not None:
+            return {
+                'remedies': self._aggregate_csr(self._csr['remedies'], symptoms, top_k),
+                'diet_plans': self._aggregate_csr(self._csr['diet_plans'], symptoms, top_k)
+            }
+
+        # [score, matches] per target node, in first-seen order; one pass
+        # over each symptom's (weight-sorted) edges covers both kinds
+        totals = {KIND_REMEDY: defaultdict(lambda: [0, 0]), KIND_DIET: defaultdict(lambda: [0, 0])}
+        node_kind = self._node_kind
 
         for symptom in symptoms:
-            # Get remedies
-            for remedy in self.get_remedies_for_symptom(symptom):
-                name = remedy['name']
-                if name not in remedies_scores:
-                    remedies_scores[name] = {
-                        'score': 0,
-                        'count': 0,
-                        'data': remedy['data']
-                    }
-                remedies_scores[name]['score'] += remedy['effectiveness']
-                remedies_scores[name]['count'] += 1
-
-            # Get diet plans
-            for diet in self.get_diet_plans_for_symptom(symptom):
-                name = diet['name']
-                if name not in diet_scores:
-                    diet_scores[name] = {
-                        'score': 0,
-                        'count': 0,
-                        'data': diet['data']
-                    }
-                diet_scores[name]['score'] += diet['effectiveness']
-                diet_scores[name]['count'] += 1
-
-        # Sort by combined score
-        remedies_list = [
-            {
-                'name': name,
-                'score': data['score'],
-                'matches': data['count'],
-                'data': data['data']
-            }
-            for name, data in remedies_scores.items()
-        ]
-        remedies_list.sort(key=lambda x: (x['matches'], x['score']), reverse=True)
+            for edge in self.adjacency_list.get(self._key("symptom", symptom), ()):
+                kind_totals = totals.get(node_kind[edge.node])
+                if kind_totals is not None:
+                    entry = kind_totals[edge.node]
+                    entry[0] += edge.weight
+                    entry[1] += 1
+
+        return {
+            'remedies': self._rank_totals(totals[KIND_REMEDY], top_k),
+            'diet_plans': self._rank_totals(totals[KIND_DIET], top_k)
+        }
 
-        diet_list = [
+    def _rank_totals(self, totals, top_k):
+        """Order accumulated targets by (matches, score) into result dicts"""
+        key = lambda item: (item[1][1], item[1][0])
+        if top_k is None:
+            ranked = sorted(totals.items(), key=key, reverse=True)
+        else:
+            # Same order as the full sort, without sorting everything
+            ranked = heapq.nlargest(top_k, totals.items(), key=key)
+
+        return [
             {
-                'name': name,
-                'score': data['score'],
-                'matches': data['count'],
-                'data': data['data']
+                'name': self._node_name[node],
+                'score': score,
+                'matches': matches,
+                'data': self.get_node_data(node)
             }
-            for name, data in diet_scores.items()
+            for node, (score, matches) in ranked
         ]
-        diet_list.sort(key=lambda x: (x['matches'], x['score']), reverse=True)
-
-        return {
-            'remedies': remedies_list,
-            'diet_plans': diet_list
-        }
@@ -3,54 +3,103 @@ Hash Table Implementation for O(1) Symptom Lookup
 Used for mapping symptoms to diet plans and home remedies
 """
 
+# Marks a slot whose entry was removed, so probe sequences keep going past it
+_DELETED = object()
+
+
 class HashTable:
+    """Open-addressing hash table (linear probing) that grows as it fills"""
+
+    MAX_LOAD_FACTOR = 0.75
+
     def __init__(self, size=100):
         self.size = size
-        self.table = [[] for _ in range(size)]
+        # Parallel key/value arrays instead of a list of buckets per slot
+        self._keys = [None] * size
+        self._values = [None] * size
         self.count = 0
-
-    def _hash(self, key):
-        """Generate hash value for a key"""
-        hash_value = 0
-        for char in str(key).lower():
-            hash_value = (hash_value * 31 + ord(char)) % self.size
-        return hash_value
+        self._used = 0  # Live entries plus tombstones
+
+    def _find_slot(self, key):
+        """
+        Probe for a lowercased key
+
+        Returns:
+            (index, found): the key's slot if present, otherwise the slot
+            it should be inserted into
+        """
+        keys = self._keys
+        size = self.size
+        # Built-in string hashing runs in C and spreads keys evenly
+        index = hash(key) % size
+        free_slot = None
+
+        for _ in range(size):
+            k = keys[index]
+            if k is None:
+                return (index if free_slot is None else free_slot), False
+            if k is _DELETED:
+                if free_slot is None:
+                    free_slot = index
+            elif k == key:
+                return index, True
+            index = (index + 1) % size
+
+        return free_slot, False
+
+    def _resize(self, new_size):
+        """Rehash all live entries into arrays of new_size (drops tombstones)"""
+        old_items = self.items()
+        self.size = new_size
+        self._keys = [None] * new_size
+        self._values = [None] * new_size
+        for key, value in old_items:
+            index, _ = self._find_slot(key)
+            self._keys[index] = key
+            self._values[index] = value
+        self._used = self.count
 
     def insert(self, key, value):
         """Insert a key-value pair into the hash table"""
-        index = self._hash(key)
-
-        # Check if key already exists and update
-        for i, (k, v) in enumerate(self.table[index]):
-            if k.lower() == key.lower():
-                # Append to existing list if value is a list
-                if isinstance(v, list) and isinstance(value, list):
-                    self.table[index][i] = (k, v + value)
-                else:
-                    self.table[index][i] = (k, value)
-                return
+        key = key.lower()
+        index, found = self._find_slot(key)
+
+        # Check if key already exists and update (stored keys are lowercase)
+        if found:
+            v = self._values[index]
+            # Append to existing list if value is a list
+            if isinstance(v, list) and isinstance(value, list):
+                self._values[index] = v + value
+            else:
+                self._values[index] = value
+            return
 
         # Insert new key-value pair
-        self.table[index].append((key.lower(), value))
+        if self._keys[index] is None:
+            self._used += 1
+        self._keys[index] = key
+        self._values[index] = value
         self.count += 1
 
+        # Keep at least a quarter of the slots empty so probes stay short
+        if self._used > self.size * self.MAX_LOAD_FACTOR:
+            grow = self.count > self.size * self.MAX_LOAD_FACTOR / 2
+            self._resize(self.size * 2 if grow else self.size)
+
     def get(self, key):
         """Retrieve value for a given key - O(1) average case"""
-        index = self._hash(key)
-        for k, v in self.table[index]:
-            if k.lower() == key.lower():
-                return v
-        return None
+        index, found = self._find_slot(key.lower())
+        return self._values[index] if found else None
 
     def remove(self, key):
         """Remove a key-value pair from the hash table"""
-        index = self._hash(key)
-        for i, (k, v) in enumerate(self.table[index]):
-            if k.lower() == key.lower():
-                del self.table[index][i]
-                self.count -= 1
-                return True
-        return False
+        index, found = self._find_slot(key.lower())
+        if not found:
+            return False
+        self._keys[index] = _DELETED
+        self._values[index] = None
+        self.count -= 1
+        return True
 
     def contains(self, key):
         """Check if key exists in hash table"""
@@ -58,36 +107,21 @@ class HashTable:
 
     def keys(self):
         """Return all keys in the hash table"""
-        all_keys = []
-        for bucket in self.table:
-            for k, v in bucket:
-                all_keys.append(k)
-        return all_keys
+        return [k for k in self._keys if k is not None and k is not _DELETED]
 
     def values(self):
         """Return all values in the hash table"""
-        all_values = []
-        for bucket in self.table:
-            for k, v in bucket:
-                all_values.append(v)
-        return all_values
+        return [v for k, v in zip(self._keys, self._values) if k is not None and k is not _DELETED]
 
     def items(self):
         """Return all key-value pairs"""
-        all_items = []
-        for bucket in self.table:
-            for k, v in bucket:
-                all_items.append((k, v))
-        return all_items
+        return [(k, v) for k, v in zip(self._keys, self._values) if k is not None and k is not _DELETED]
 
     def __len__(self):
         return self.count
 
     def __str__(self):
-        items = []
-        for bucket in self.table:
-            for k, v in bucket:
-                items.append(f"{k}: {v}")
+        items = [f"{k}: {v}" for k, v in self.items()]
         return "{" + ", ".join(items) + "}"
 
 
@@ -101,8 +135,9 @@ class SymptomHashTable(HashTable):
         existing = self.get(symptom)
         if existing:
             if isinstance(existing, list):
+                # The stored list is updated in place; re-inserting it would
+                # merge the list with itself and double every entry
                 existing.append(remedy_data)
-                self.insert(symptom, existing)
             else:
                 self.insert(symptom, [existing, remedy_data])
         else:
@@ -117,9 +152,10 @@ class SymptomHashTable(HashTable):
 
     def search_partial(self, partial_symptom):
         """Search for symptoms containing the partial string"""
-        matches = []
         partial_lower = partial_symptom.lower()
-        for key in self.keys():
-            if partial_lower in key.lower():
-                matches.append((key, self.get(key)))
-        return matches
+        # One pass over the slots (stored keys are already lowercase)
+        # instead of probing the table again for every matching key
+        return [
+            (key, value) for key, value in zip(self._keys, self._values)
+            if key is not None and key is not _DELETED and partial_lower in key
+        ]
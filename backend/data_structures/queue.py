@@ -4,14 +4,35 @@ Used for managing health reminders and notifications
 """
 
 import heapq
-from datetime import datetime
+import threading
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from itertools import islice
+from operator import itemgetter
+
+
+def _local_isoformat(timestamp):
+    """
+    A datetime or ISO 8601 string as naive local time in isoformat(), the
+    form add_symptom_record writes with datetime.now()
+    """
+    if isinstance(timestamp, str):
+        # fromisoformat only accepts a "Z" suffix from Python 3.11 on
+        if timestamp.endswith(('Z', 'z')):
+            timestamp = timestamp[:-1] + '+00:00'
+        timestamp = datetime.fromisoformat(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone().replace(tzinfo=None)
+    return timestamp.isoformat()
 
 
 class Queue:
     """Basic FIFO Queue implementation"""
 
-    def __init__(self):
-        self.items = []
+    def __init__(self, maxlen=None):
+        # deque gives O(1) pops from the front; with maxlen the oldest
+        # items are dropped automatically as new ones arrive
+        self.items = deque(maxlen=maxlen)
 
     def enqueue(self, item):
         """Add item to the end of queue"""
@@ -21,7 +42,7 @@ class Queue:
         """Remove and return item from front of queue"""
         if self.is_empty():
             return None
-        return self.items.pop(0)
+        return self.items.popleft()
 
     def peek(self):
         """Return front item without removing"""
@@ -39,13 +60,13 @@ class Queue:
 
     def clear(self):
         """Clear all items from queue"""
-        self.items = []
+        self.items.clear()
 
     def __len__(self):
         return len(self.items)
 
     def __str__(self):
-        return str(self.items)
+        return str(list(self.items))
 
 
 class PriorityQueue:
@@ -151,8 +172,57 @@ class SymptomHistoryQueue(Queue):
     """Queue for managing symptom history"""
 
     def __init__(self, max_size=100):
-        super().__init__()
+        super().__init__(maxlen=max_size)
         self.max_size = max_size
+        # Running symptom counts over the records currently held, kept in
+        # step with every append and eviction
+        self._frequency = Counter()
+        # The engine's history is shared by request threads; the deque and
+        # the counts must change together or the counts drift for good
+        self._lock = threading.Lock()
+
+    def _count(self, records):
+        """Add the records' symptoms to the running counts"""
+        self._frequency.update(
+            symptom.lower()
+            for record in records
+            for symptom in record['symptoms']
+        )
+
+    def _uncount(self, records):
+        """Take evicted records' symptoms out of the running counts"""
+        frequency = self._frequency
+        for record in records:
+            for symptom in record['symptoms']:
+                key = symptom.lower()
+                frequency[key] -= 1
+                if frequency[key] <= 0:
+                    del frequency[key]
+
+    def enqueue(self, item):
+        """Add a record, evicting the oldest one if the queue is full"""
+        items = self.items
+        if items.maxlen == 0:
+            return
+        with self._lock:
+            if len(items) == items.maxlen:
+                self._uncount((items[0],))
+            items.append(item)
+            self._count((item,))
+
+    def dequeue(self):
+        """Remove and return the oldest record"""
+        with self._lock:
+            record = super().dequeue()
+            if record is not None:
+                self._uncount((record,))
+        return record
+
+    def clear(self):
+        """Clear all records and their symptom counts"""
+        with self._lock:
+            super().clear()
+            self._frequency.clear()
 
     def add_symptom_record(self, symptoms, severity, recommendations):
         """Add a symptom record to history"""
@@ -163,49 +233,73 @@ class SymptomHistoryQueue(Queue):
             'timestamp': datetime.now().isoformat()
         }
 
+        # The bounded deque discards the oldest record once max_size is hit
         self.enqueue(record)
 
-        # Keep only the most recent records
-        while self.size() > self.max_size:
-            self.dequeue()
-
         return record
 
+    def bulk_add(self, records):
+        """
+        Append many prebuilt records (oldest first) in one call
+
+        Only the newest max_size records can survive the cap, so the rest
+        are dropped before they reach the deque. Records without a
+        timestamp are stamped with the current time; the others are
+        normalised to naive local isoformat() (raising ValueError if
+        unparseable) and put in time order, as get_recent_symptoms expects.
+        """
+        now = datetime.now().isoformat()
+        records = [
+            {**record, 'timestamp': _local_isoformat(record['timestamp'])}
+            if 'timestamp' in record else {**record, 'timestamp': now}
+            for record in records
+        ]
+        # get_recent_symptoms relies on the deque being in time order
+        records.sort(key=itemgetter('timestamp'))
+
+        items = self.items
+        with self._lock:
+            if items and records and records[0]['timestamp'] < items[-1]['timestamp']:
+                # Some records predate ones already held: merge them in
+                # (held records first on equal timestamps) and recount
+                records = sorted([*items, *records], key=itemgetter('timestamp'))
+                items.clear()
+                self._frequency.clear()
+
+            if self.max_size is not None:
+                records = records[-self.max_size:] if self.max_size else []
+                overflow = len(items) + len(records) - self.max_size
+                if overflow > 0:
+                    self._uncount(islice(items, overflow))
+            items.extend(records)
+            self._count(records)
+
     def get_history(self, limit=None):
         """Get symptom history (most recent first)"""
-        history = list(reversed(self.items))
-        if limit:
-            return history[:limit]
-        return history
+        with self._lock:
+            if limit:
+                return list(islice(reversed(self.items), limit))
+            return list(reversed(self.items))
 
     def get_symptom_frequency(self):
         """Analyze frequency of symptoms"""
-        frequency = {}
-        for record in self.items:
-            for symptom in record['symptoms']:
-                symptom_lower = symptom.lower()
-                if symptom_lower not in frequency:
-                    frequency[symptom_lower] = 0
-                frequency[symptom_lower] += 1
-
-        # Sort by frequency
-        sorted_freq = sorted(
-            frequency.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        return sorted_freq
+        # Sorted by count, ties in the order the symptoms were first counted
+        with self._lock:
+            return self._frequency.most_common()
 
     def get_recent_symptoms(self, days=7):
         """Get symptoms from the last N days"""
-        from datetime import timedelta
-
-        cutoff = datetime.now() - timedelta(days=days)
+        # isoformat() strings compare in chronological order, so the cutoff
+        # is formatted once instead of parsing every record's timestamp
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
         recent = []
 
-        for record in self.items:
-            record_time = datetime.fromisoformat(record['timestamp'])
-            if record_time >= cutoff:
+        # Records are appended in time order: walk newest first and stop at
+        # the first one older than the cutoff
+        with self._lock:
+            for record in reversed(self.items):
+                if record['timestamp'] < cutoff:
+                    break
                 recent.append(record)
 
-        return list(reversed(recent))
+        return recent
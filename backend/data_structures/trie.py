@@ -3,128 +3,540 @@ Trie (Prefix Tree) Implementation for Autocomplete Functionality
 Used for suggesting symptoms as user types
 """
 
+import heapq
+import os
+import pickle
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+
+
 class TrieNode:
+    # Most nodes have zero or one child, so children are kept as a sorted
+    # string of chars plus a parallel tuple of nodes (leaves share the
+    # empty ones) and only promoted to a dict once a node gets crowded
+    __slots__ = ('child_chars', 'child_nodes', 'children_dict',
+                 '_flags', 'word', 'max_subtree_freq', 'metadata')
+
+    MAX_ARRAY_CHILDREN = 16
+
     def __init__(self):
-        self.children = {}
-        self.is_end_of_word = False
+        self.child_chars = ''
+        self.child_nodes = ()
+        self.children_dict = None
+        # Bit 0: is_end_of_word; the remaining bits: how often the word
+        # was searched. Hot loops read _flags directly
+        self._flags = 0
         self.word = None  # Store the complete word at end nodes
-        self.frequency = 0  # Track how often this word is searched
+        # Upper bound on the frequency of any word at or below this node
+        self.max_subtree_freq = 0
+        self.metadata = None  # Extra data kept with the word at end nodes
+
+    @property
+    def is_end_of_word(self):
+        return bool(self._flags & 1)
+
+    @is_end_of_word.setter
+    def is_end_of_word(self, value):
+        self._flags = (self._flags & ~1) | bool(value)
+
+    @property
+    def frequency(self):
+        """Track how often this word is searched"""
+        return self._flags >> 1
+
+    @frequency.setter
+    def frequency(self, value):
+        self._flags = (self._flags & 1) | (value << 1)
+
+    def get_child(self, char):
+        """Get the child for a char, or None"""
+        if self.children_dict is not None:
+            return self.children_dict.get(char)
+        i = self.child_chars.find(char)
+        return self.child_nodes[i] if i >= 0 else None
+
+    def add_child(self, char):
+        """Get the child for a char, creating it if needed"""
+        child = self.get_child(char)
+        if child is not None:
+            return child
+
+        child = TrieNode()
+        if self.children_dict is not None:
+            self.children_dict[char] = child
+        elif len(self.child_nodes) < self.MAX_ARRAY_CHILDREN:
+            i = bisect_left(self.child_chars, char)
+            self.child_chars = self.child_chars[:i] + char + self.child_chars[i:]
+            self.child_nodes = self.child_nodes[:i] + (child,) + self.child_nodes[i:]
+        else:
+            self.children_dict = dict(zip(self.child_chars, self.child_nodes))
+            self.children_dict[char] = child
+            self.child_chars = ''
+            self.child_nodes = ()
+        return child
+
+    def remove_child(self, char):
+        """Remove the child for a char"""
+        if self.children_dict is not None:
+            del self.children_dict[char]
+            return
+        i = self.child_chars.find(char)
+        self.child_chars = self.child_chars[:i] + self.child_chars[i + 1:]
+        self.child_nodes = self.child_nodes[:i] + self.child_nodes[i + 1:]
+
+    def iter_children(self):
+        """Iterate (char, child) pairs in char order"""
+        if self.children_dict is not None:
+            return iter(sorted(self.children_dict.items()))
+        return zip(self.child_chars, self.child_nodes)
+
+    def children_in_order(self):
+        """Child nodes in char order"""
+        if self.children_dict is not None:
+            return [child for _, child in sorted(self.children_dict.items())]
+        return self.child_nodes
+
+    def has_children(self):
+        return bool(self.child_nodes or self.children_dict)
+
+    @property
+    def children(self):
+        """Dict view of the children (a copy)"""
+        return dict(self.iter_children())
 
 
 class Trie:
+    # Most recent (prefix, max_results) autocomplete answers kept
+    AUTOCOMPLETE_CACHE_SIZE = 2048
+    # Bump whenever the pickled layout of Trie/TrieNode/FrozenTrie changes,
+    # so caches written by older code are not loaded (see save/load)
+    PICKLE_VERSION = 1
+
     def __init__(self):
         self.root = TrieNode()
         self.word_count = 0
+        self._frozen = None  # FrozenTrie snapshot, see freeze()
+        self._autocomplete_cache = OrderedDict()
+
+    def _on_mutate(self):
+        """Drop the frozen snapshot and cached answers after a word change"""
+        self._frozen = None
+        self._autocomplete_cache.clear()
 
     def insert(self, word):
         """Insert a word into the trie"""
+        self._insert(word)
+
+    def _insert(self, word):
+        """Insert a word and return its end node (None for an empty word)"""
         if not word:
-            return
+            return None
 
+        self._on_mutate()
         node = self.root
-        word_lower = word.lower().strip()
+        # Interned so every copy of a symptom name handed out shares one object
+        word_lower = sys.intern(word.lower().strip())
 
         for char in word_lower:
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
+            node = node.add_child(char)
 
         if not node.is_end_of_word:
             self.word_count += 1
 
         node.is_end_of_word = True
         node.word = word_lower
+        return node
+
+    def bulk_insert(self, words):
+        """Insert many words in one pass over their sorted order"""
+        self._bulk_insert(words)
+
+    def _bulk_insert(self, words):
+        """
+        Insert words and return {word: end node}
+
+        Sorted input means consecutive words share their common prefix, so
+        the path to the previous word is reused and only the diverging
+        suffix is walked (or created) for each word.
+        """
+        words = sorted({sys.intern(word.lower().strip()) for word in words if word})
+        if not words:
+            return {}
+
+        self._on_mutate()
+        end_nodes = {}
+        path = [self.root]
+        previous = ''
+        for word in words:
+            common = 0
+            limit = min(len(previous), len(word))
+            while common < limit and previous[common] == word[common]:
+                common += 1
+            del path[common + 1:]
+
+            node = path[-1]
+            for char in word[common:]:
+                node = node.add_child(char)
+                path.append(node)
+
+            if not node.is_end_of_word:
+                self.word_count += 1
+            node.is_end_of_word = True
+            node.word = word
+            end_nodes[word] = node
+            previous = word
+
+        return end_nodes
 
     def search(self, word):
         """Check if a word exists in the trie"""
-        node = self._find_node(word.lower())
+        word = word.lower()
+        if self._frozen is not None:
+            return self._frozen._search(word)
+        node = self._find_node(word)
         return node is not None and node.is_end_of_word
 
     def _find_node(self, prefix):
-        """Find the node corresponding to a prefix"""
+        """Find the node corresponding to an already lowercased prefix"""
         node = self.root
-        for char in prefix.lower():
-            if char not in node.children:
+        for char in prefix:
+            node = node.get_child(char)
+            if node is None:
                 return None
-            node = node.children[char]
         return node
 
     def starts_with(self, prefix):
         """Check if any word in trie starts with given prefix"""
-        return self._find_node(prefix.lower()) is not None
+        prefix = prefix.lower()
+        if self._frozen is not None:
+            return self._frozen._starts_with(prefix)
+        return self._find_node(prefix) is not None
 
     def autocomplete(self, prefix, max_results=10):
-        """Get all words that start with the given prefix"""
-        results = []
-        node = self._find_node(prefix.lower())
-
-        if node is None:
-            return results
-
-        self._collect_words(node, results, max_results)
-
-        # Sort by frequency (most searched first)
-        results.sort(key=lambda x: x[1], reverse=True)
-        return [word for word, freq in results[:max_results]]
-
-    def _collect_words(self, node, results, max_results):
-        """Recursively collect all words from a node"""
-        if len(results) >= max_results * 2:  # Collect more for sorting
-            return
-
-        if node.is_end_of_word:
-            results.append((node.word, node.frequency))
-
-        for char, child_node in node.children.items():
-            self._collect_words(child_node, results, max_results)
+        """Get words that start with the given prefix, most searched first"""
+        prefix = prefix.lower()
+        key = (prefix, max_results)
+        cache = self._autocomplete_cache
+        cached = cache.get(key)
+        if cached is not None:
+            try:
+                cache.move_to_end(key)
+            except KeyError:
+                pass  # Evicted by another thread in between
+            return list(cached)
+
+        results = self._autocomplete(prefix, max_results)
+        cache[key] = tuple(results)
+        if len(cache) > self.AUTOCOMPLETE_CACHE_SIZE:
+            try:
+                cache.popitem(last=False)
+            except KeyError:
+                pass
+        return results
+
+    def _autocomplete(self, prefix, max_results):
+        if self._frozen is not None:
+            return self._frozen._autocomplete(prefix, max_results)
+        return [node.word for node in self._top_nodes(prefix, max_results)]
+
+    def _top_nodes(self, prefix, max_results):
+        """End nodes of the best max_results words under a lowercased prefix"""
+        node = self._find_node(prefix)
+        if node is None or max_results <= 0:
+            return []
+
+        # Min-heap of the best max_results words seen so far, as
+        # (frequency, -visit order, node). Words are visited alphabetically,
+        # so on equal frequency the later word ranks lower and the root is
+        # always the weakest entry; subtrees that cannot beat it are skipped
+        heap = []
+        visited = 0
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if len(heap) == max_results and node.max_subtree_freq <= heap[0][0]:
+                continue
+
+            flags = node._flags
+            if flags & 1:
+                visited += 1
+                # Only words that make it into the heap get a tuple
+                if len(heap) < max_results:
+                    heapq.heappush(heap, (flags >> 1, -visited, node))
+                elif flags >> 1 > heap[0][0]:
+                    heapq.heapreplace(heap, (flags >> 1, -visited, node))
+
+            stack.extend(reversed(node.children_in_order()))
+
+        # Most searched first, then alphabetically (visit order is unique,
+        # so nodes themselves are never compared)
+        return [node for _, _, node in sorted(heap, reverse=True)]
 
     def increment_frequency(self, word):
         """Increment the search frequency of a word"""
-        node = self._find_node(word.lower())
-        if node and node.is_end_of_word:
+        word = word.lower()
+        path = [self.root]
+        for char in word:
+            child = path[-1].get_child(char)
+            if child is None:
+                return
+            path.append(child)
+
+        node = path[-1]
+        if node.is_end_of_word:
             node.frequency += 1
+            for ancestor in path:
+                if ancestor.max_subtree_freq < node.frequency:
+                    ancestor.max_subtree_freq = node.frequency
+            self._autocomplete_cache.clear()
+            if self._frozen is not None:
+                self._frozen._increment_frequency(word)
 
     def get_all_words(self):
         """Get all words in the trie"""
         words = []
-        self._collect_all_words(self.root, "", words)
+        self._collect_all_words(self.root, words)
         return words
 
-    def _collect_all_words(self, node, current_word, words):
-        """Recursively collect all words"""
-        if node.is_end_of_word:
-            words.append(node.word)
-
-        for char, child_node in node.children.items():
-            self._collect_all_words(child_node, current_word + char, words)
+    def _collect_all_words(self, node, words):
+        """Collect all words at or below a node, alphabetically"""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node._flags & 1:
+                words.append(node.word)
+            stack.extend(reversed(node.children_in_order()))
 
     def delete(self, word):
         """Delete a word from the trie"""
-        return self._delete_helper(self.root, word.lower(), 0)
-
-    def _delete_helper(self, node, word, index):
-        """Helper function for deletion"""
-        if index == len(word):
-            if not node.is_end_of_word:
+        self._on_mutate()
+        return self._delete_helper(self.root, word.lower())
+
+    def _delete_helper(self, node, word):
+        """
+        Unmark a word, then prune the nodes it leaves empty
+
+        Returns:
+            True if the root itself is left empty (as the recursive version did)
+        """
+        path = []
+        for char in word:
+            child = node.get_child(char)
+            if child is None:
                 return False
-            node.is_end_of_word = False
-            node.word = None
-            self.word_count -= 1
-            return len(node.children) == 0
+            path.append((node, char))
+            node = child
 
-        char = word[index]
-        if char not in node.children:
+        if not node.is_end_of_word:
             return False
+        node.is_end_of_word = False
+        node.word = None
+        self.word_count -= 1
+
+        # Walk back up, unlinking children that have become dead ends
+        should_delete = not node.has_children()
+        for parent, char in reversed(path):
+            if not should_delete:
+                return False
+            parent.remove_child(char)
+            should_delete = not parent.has_children() and not parent.is_end_of_word
+        return should_delete
+
+    def freeze(self):
+        """
+        Snapshot the trie into a FrozenTrie for faster lookups
+
+        While frozen, search, starts_with and autocomplete run against the
+        flat arrays. Inserting or deleting a word drops the snapshot.
+        """
+        self._frozen = FrozenTrie(self)
+        return self._frozen
+
+    def is_frozen(self):
+        return self._frozen is not None
+
+    def __getstate__(self):
+        # Memoized answers are cheap to recompute; keep them out of pickles
+        state = self.__dict__.copy()
+        state['_autocomplete_cache'] = OrderedDict()
+        return state
+
+    def save(self, path):
+        """
+        Pickle the trie (including its frozen snapshot) to path
+
+        The file is written next to path and renamed into place, so
+        concurrent readers never see a partial pickle.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(self, f, protocol=5)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Load a trie written by save(); raises TypeError for other objects"""
+        with open(path, 'rb') as f:
+            trie = pickle.load(f)
+        if not isinstance(trie, cls):
+            raise TypeError(f"{path} does not hold a {cls.__name__}")
+        return trie
+
+    def __len__(self):
+        return self.word_count
+
+    def __contains__(self, word):
+        return self.search(word)
+
+
+class FrozenTrie:
+    """
+    Read-only, array-backed snapshot of a Trie
+
+    Nodes are numbered in BFS order and every node is reachable by its
+    prefix through one dict, so finding a prefix is a single hash lookup
+    done in C rather than a per-character walk in Python. Words are
+    numbered in preorder, which makes them alphabetical and lets each node
+    own the contiguous word range word_start[n]:word_end[n].
+    """
+
+    def __init__(self, trie):
+        self.word_count = len(trie)
+        self._build(trie.root)
+
+    def _build(self, root):
+        """Lay out nodes breadth-first, then number words depth-first"""
+        nodes = [root]
+        prefixes = ['']
+        # Children of node n are child_nodes[child_start[n]:child_start[n + 1]]
+        child_start = array('i', [0])
+        child_nodes = array('i')
+
+        i = 0
+        while i < len(nodes):
+            for char, child in nodes[i].iter_children():
+                child_nodes.append(len(nodes))
+                nodes.append(child)
+                prefixes.append(prefixes[i] + char)
+            child_start.append(len(child_nodes))
+            i += 1
+
+        n_nodes = len(nodes)
+        word_start = array('i', [0]) * n_nodes
+        word_end = array('i', [0]) * n_nodes
+        word_index = array('i', [-1]) * n_nodes
+        words = []
+        metadata = []
+        frequency = array('i')
+
+        # Iterative preorder; ~node_id marks leaving a node's subtree
+        stack = [0]
+        while stack:
+            node_id = stack.pop()
+            if node_id < 0:
+                word_end[~node_id] = len(words)
+                continue
+
+            node = nodes[node_id]
+            word_start[node_id] = len(words)
+            flags = node._flags
+            if flags & 1:
+                word_index[node_id] = len(words)
+                words.append(node.word)
+                metadata.append(node.metadata)
+                frequency.append(flags >> 1)
+
+            stack.append(~node_id)
+            stack.extend(reversed(child_nodes[child_start[node_id]:child_start[node_id + 1]]))
+
+        self._node_by_prefix = {prefix: node_id for node_id, prefix in enumerate(prefixes)}
+        self._word_start = word_start
+        self._word_end = word_end
+        self._word_index = word_index
+        self._words = words
+        self._metadata = metadata
+        self._frequency = frequency
+        self._max_frequency = max(frequency, default=0)
+
+    # The public methods lowercase their input once; the underscored
+    # versions take it already lowercased (Trie calls those directly)
+
+    def _find_node(self, prefix):
+        """Find the node id for an already lowercased prefix, or -1"""
+        return self._node_by_prefix.get(prefix, -1)
+
+    def search(self, word):
+        """Check if a word exists in the trie"""
+        return self._search(word.lower())
+
+    def _search(self, word):
+        node = self._find_node(word)
+        return node >= 0 and self._word_index[node] >= 0
 
-        should_delete_child = self._delete_helper(
-            node.children[char], word, index + 1
+    def starts_with(self, prefix):
+        """Check if any word in trie starts with given prefix"""
+        return self._starts_with(prefix.lower())
+
+    def _starts_with(self, prefix):
+        return self._find_node(prefix) >= 0
+
+    def autocomplete(self, prefix, max_results=10):
+        """Get words that start with the given prefix, most searched first"""
+        return self._autocomplete(prefix.lower(), max_results)
+
+    def _autocomplete(self, prefix, max_results):
+        words = self._words
+        return [words[i] for i in self._top_word_ids(prefix, max_results)]
+
+    def _top_word_ids(self, prefix, max_results):
+        """Ids of the best max_results words under a lowercased prefix"""
+        node = self._find_node(prefix)
+        if node < 0:
+            return range(0)
+
+        start = self._word_start[node]
+        end = self._word_end[node]
+        if self._max_frequency == 0:
+            # Nothing searched yet: the ranking is just alphabetical
+            return range(start, min(end, start + max(max_results, 0)))
+
+        frequency = self._frequency
+        # Word ids are alphabetical, so ties on frequency stay alphabetical
+        return heapq.nsmallest(
+            max_results,
+            range(start, end),
+            key=lambda i: -frequency[i]
         )
 
-        if should_delete_child:
-            del node.children[char]
-            return len(node.children) == 0 and not node.is_end_of_word
+    def _autocomplete_with_metadata(self, prefix, max_results):
+        """(word, metadata) pairs for the best words under a lowercased prefix"""
+        words = self._words
+        metadata = self._metadata
+        return [(words[i], metadata[i]) for i in self._top_word_ids(prefix, max_results)]
+
+    def _get_metadata(self, word):
+        node = self._find_node(word)
+        if node < 0 or self._word_index[node] < 0:
+            return None
+        return self._metadata[self._word_index[node]]
 
-        return False
+    def increment_frequency(self, word):
+        """Increment the search frequency of a word"""
+        self._increment_frequency(word.lower())
+
+    def _increment_frequency(self, word):
+        node = self._find_node(word)
+        if node >= 0 and self._word_index[node] >= 0:
+            index = self._word_index[node]
+            self._frequency[index] += 1
+            self._max_frequency = max(self._max_frequency, self._frequency[index])
 
     def __len__(self):
         return self.word_count
@@ -135,29 +547,48 @@ class Trie:
 
 # Specialized Trie for Symptoms
 class SymptomTrie(Trie):
-    def __init__(self):
-        super().__init__()
-        self.symptom_data = {}  # Store additional data for each symptom
-
     def insert_symptom(self, symptom, severity_range=None, category=None):
         """Insert a symptom with additional metadata"""
-        self.insert(symptom)
-        self.symptom_data[symptom.lower()] = {
-            'severity_range': severity_range or (1, 10),
-            'category': category or 'general'
-        }
+        node = self._insert(symptom)
+        if node is not None:
+            node.metadata = {
+                'severity_range': severity_range or (1, 10),
+                'category': category or 'general'
+            }
+
+    def bulk_insert_symptoms(self, symptoms):
+        """
+        Insert many symptoms with metadata in one pass (see bulk_insert)
+
+        Args:
+            symptoms: Iterable of (name, severity_range, category)
+        """
+        symptoms = list(symptoms)
+        end_nodes = self._bulk_insert(name for name, _, _ in symptoms)
+        for name, severity_range, category in symptoms:
+            if name:
+                end_nodes[name.lower().strip()].metadata = {
+                    'severity_range': severity_range or (1, 10),
+                    'category': category or 'general'
+                }
 
     def get_symptom_data(self, symptom):
         """Get metadata for a symptom"""
-        return self.symptom_data.get(symptom.lower())
+        symptom = symptom.lower()
+        if self._frozen is not None:
+            return self._frozen._get_metadata(symptom)
+        node = self._find_node(symptom)
+        return node.metadata if node is not None and node.is_end_of_word else None
 
     def autocomplete_with_data(self, prefix, max_results=10):
         """Get autocomplete suggestions with their metadata"""
-        words = self.autocomplete(prefix, max_results)
+        prefix = prefix.lower()
+        if self._frozen is not None:
+            matches = self._frozen._autocomplete_with_metadata(prefix, max_results)
+        else:
+            matches = [(node.word, node.metadata) for node in self._top_nodes(prefix, max_results)]
+
         return [
-            {
-                'symptom': word,
-                'data': self.symptom_data.get(word, {})
-            }
-            for word in words
+            {'word': word, **(metadata or {})}
+            for word, metadata in matches
         ]
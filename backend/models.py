@@ -1,16 +1,55 @@
 """
 Database Models for Smart Health Management System
 Uses SQLAlchemy ORM with SQLite database
+
+to_dict() on the list models (symptom history, vitals, reminders) leaves
+datetimes as datetime objects; the app's JSON provider writes them as
+ISO 8601, natively when orjson is installed
 """
 
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy import event, inspect, select, text
+from sqlalchemy.engine import Engine
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
-import json
+import sqlite3
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # fall back to werkzeug's (much slower) scrypt hashes
+    PasswordHasher = None
 
 db = SQLAlchemy()
 
+# OWASP's baseline Argon2id profile: 19 MiB of memory, 2 passes, 1 lane
+_password_hasher = (
+    PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+    if PasswordHasher is not None else None
+)
+
+
+class RowDictMixin:
+    """
+    Listing support for models whose to_dict() only reads plain columns
+
+    query_dicts() selects just the DICT_COLUMNS with a Core select and
+    passes each result row to to_dict() in place of an instance (rows
+    expose columns as attributes), skipping ORM object construction and
+    identity-map bookkeeping for every row of a list endpoint.
+    """
+    DICT_COLUMNS = ()
+
+    @classmethod
+    def query_dicts(cls, *criteria, order_by=None, limit=None):
+        stmt = select(*(getattr(cls, name) for name in cls.DICT_COLUMNS)).where(*criteria)
+        if order_by is not None:
+            stmt = stmt.order_by(order_by)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [cls.to_dict(row) for row in db.session.execute(stmt)]
+
 
 class User(UserMixin, db.Model):
     """User model for authentication"""
@@ -35,11 +74,34 @@ class User(UserMixin, db.Model):
 
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = generate_password_hash(password)
+        if _password_hasher is not None:
+            self.password_hash = _password_hasher.hash(password)
+        else:
+            self.password_hash = generate_password_hash(password)
 
     def check_password(self, password):
-        """Check password against hash"""
-        return check_password_hash(self.password_hash, password)
+        """
+        Check password against hash
+
+        A matching hash in an older format (werkzeug's, or Argon2 with
+        outdated parameters) is replaced in place; the caller commits it.
+        """
+        if self.password_hash.startswith('$argon2'):
+            if _password_hasher is None:
+                return False
+            try:
+                _password_hasher.verify(self.password_hash, password)
+            except (VerificationError, InvalidHashError):
+                return False
+            if _password_hasher.check_needs_rehash(self.password_hash):
+                self.set_password(password)
+            return True
+
+        if not check_password_hash(self.password_hash, password):
+            return False
+        if _password_hasher is not None:
+            self.set_password(password)
+        return True
 
     def to_dict(self):
         """Convert to dictionary"""
@@ -110,35 +172,23 @@ class Remedy(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), unique=True, nullable=False, index=True)
     description = db.Column(db.Text, nullable=False)
-    ingredients = db.Column(db.Text)  # JSON string
+    ingredients = db.Column(db.JSON)  # List of strings
     preparation = db.Column(db.Text)
     effectiveness = db.Column(db.Integer, default=5)
     time_to_effect = db.Column(db.String(50))
     safety_notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    # Many-to-many with symptoms
-    symptoms = db.relationship('RemedySymptom', backref='remedy', lazy='dynamic')
-
-    def get_ingredients(self):
-        """Get ingredients as list"""
-        if self.ingredients:
-            try:
-                return json.loads(self.ingredients)
-            except json.JSONDecodeError:
-                return []
-        return []
-
-    def set_ingredients(self, ingredients_list):
-        """Set ingredients from list"""
-        self.ingredients = json.dumps(ingredients_list)
+    # Many-to-many with symptoms; loaded in one batched query per list of
+    # remedies since to_dict() always walks it
+    symptoms = db.relationship('RemedySymptom', backref='remedy', lazy='selectin')
 
     def to_dict(self):
         return {
             'id': self.id,
             'name': self.name,
             'description': self.description,
-            'ingredients': self.get_ingredients(),
+            'ingredients': self.ingredients or [],
             'preparation': self.preparation,
             'effectiveness': self.effectiveness,
             'time_to_effect': self.time_to_effect,
@@ -159,7 +209,7 @@ class RemedySymptom(db.Model):
     symptom_id = db.Column(db.Integer, db.ForeignKey('symptoms.id'), nullable=False)
     effectiveness_for_symptom = db.Column(db.Integer, default=5)
 
-    symptom = db.relationship('Symptom')
+    symptom = db.relationship('Symptom', lazy='selectin')
 
 
 class DietPlan(db.Model):
@@ -169,58 +219,26 @@ class DietPlan(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), unique=True, nullable=False, index=True)
     description = db.Column(db.Text, nullable=False)
-    foods_to_eat = db.Column(db.Text)  # JSON string
-    foods_to_avoid = db.Column(db.Text)  # JSON string
-    meal_suggestions = db.Column(db.Text)  # JSON string
+    foods_to_eat = db.Column(db.JSON)  # List of strings
+    foods_to_avoid = db.Column(db.JSON)  # List of strings
+    meal_suggestions = db.Column(db.JSON)  # Dict of meal -> suggestions
     effectiveness = db.Column(db.Integer, default=5)
     duration = db.Column(db.String(50))
     daily_calories = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    # Many-to-many with symptoms
-    symptoms = db.relationship('DietPlanSymptom', backref='diet_plan', lazy='dynamic')
-
-    def get_foods_to_eat(self):
-        if self.foods_to_eat:
-            try:
-                return json.loads(self.foods_to_eat)
-            except json.JSONDecodeError:
-                return []
-        return []
-
-    def set_foods_to_eat(self, foods_list):
-        self.foods_to_eat = json.dumps(foods_list)
-
-    def get_foods_to_avoid(self):
-        if self.foods_to_avoid:
-            try:
-                return json.loads(self.foods_to_avoid)
-            except json.JSONDecodeError:
-                return []
-        return []
-
-    def set_foods_to_avoid(self, foods_list):
-        self.foods_to_avoid = json.dumps(foods_list)
-
-    def get_meal_suggestions(self):
-        if self.meal_suggestions:
-            try:
-                return json.loads(self.meal_suggestions)
-            except json.JSONDecodeError:
-                return {}
-        return {}
-
-    def set_meal_suggestions(self, meals_dict):
-        self.meal_suggestions = json.dumps(meals_dict)
+    # Many-to-many with symptoms; loaded in one batched query per list of
+    # diet plans since to_dict() always walks it
+    symptoms = db.relationship('DietPlanSymptom', backref='diet_plan', lazy='selectin')
 
     def to_dict(self):
         return {
             'id': self.id,
             'name': self.name,
             'description': self.description,
-            'foods_to_eat': self.get_foods_to_eat(),
-            'foods_to_avoid': self.get_foods_to_avoid(),
-            'meal_suggestions': self.get_meal_suggestions(),
+            'foods_to_eat': self.foods_to_eat or [],
+            'foods_to_avoid': self.foods_to_avoid or [],
+            'meal_suggestions': self.meal_suggestions or {},
             'effectiveness': self.effectiveness,
             'duration': self.duration,
             'daily_calories': self.daily_calories,
@@ -240,60 +258,62 @@ class DietPlanSymptom(db.Model):
     symptom_id = db.Column(db.Integer, db.ForeignKey('symptoms.id'), nullable=False)
     effectiveness_for_symptom = db.Column(db.Integer, default=5)
 
-    symptom = db.relationship('Symptom')
+    symptom = db.relationship('Symptom', lazy='selectin')
 
 
-class SymptomRecord(db.Model):
+class SymptomRecord(RowDictMixin, db.Model):
     """User's symptom search/analysis history"""
     __tablename__ = 'symptom_records'
+    __table_args__ = (
+        # Serves the per-user "latest N" history query without a sort
+        db.Index('ix_symptom_records_user_created', 'user_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
-    symptoms = db.Column(db.Text, nullable=False)  # JSON string of symptom list
+    symptoms = db.Column(db.JSON, nullable=False)  # List of symptom names
     severity = db.Column(db.Integer, default=5)
-    recommendations = db.Column(db.Text)  # JSON string
+    recommendations = db.Column(db.JSON)  # Summary dict
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
-    def get_symptoms(self):
-        if self.symptoms:
-            try:
-                return json.loads(self.symptoms)
-            except json.JSONDecodeError:
-                return []
-        return []
-
-    def set_symptoms(self, symptoms_list):
-        self.symptoms = json.dumps(symptoms_list)
-
-    def get_recommendations(self):
-        if self.recommendations:
-            try:
-                return json.loads(self.recommendations)
-            except json.JSONDecodeError:
-                return {}
-        return {}
-
-    def set_recommendations(self, recommendations_dict):
-        self.recommendations = json.dumps(recommendations_dict)
+    DICT_COLUMNS = ('id', 'symptoms', 'severity', 'recommendations', 'notes', 'created_at')
 
     def to_dict(self):
         return {
             'id': self.id,
-            'symptoms': self.get_symptoms(),
+            'symptoms': self.symptoms or [],
             'severity': self.severity,
-            'recommendations': self.get_recommendations(),
+            'recommendations': self.recommendations or {},
             'notes': self.notes,
-            'timestamp': self.created_at.isoformat() if self.created_at else None
+            'timestamp': self.created_at
         }
 
     def __repr__(self):
         return f'<SymptomRecord {self.id}>'
 
 
-class VitalRecord(db.Model):
+class SymptomFrequency(db.Model):
+    """Running per-user count of each (lowercased) symptom searched"""
+    __tablename__ = 'symptom_frequencies'
+    __table_args__ = (
+        db.Index('ix_symptom_frequencies_user_count', 'user_id', 'count'),
+    )
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    symptom = db.Column(db.String(100), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<SymptomFrequency {self.user_id}:{self.symptom}={self.count}>'
+
+
+class VitalRecord(RowDictMixin, db.Model):
     """User's vital signs records"""
     __tablename__ = 'vital_records'
+    __table_args__ = (
+        db.Index('ix_vital_records_user_measured', 'user_id', 'measured_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
@@ -307,6 +327,11 @@ class VitalRecord(db.Model):
     measured_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    DICT_COLUMNS = (
+        'id', 'heart_rate', 'blood_pressure_systolic', 'blood_pressure_diastolic',
+        'temperature', 'oxygen_saturation', 'weight', 'notes', 'measured_at', 'created_at'
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -319,8 +344,8 @@ class VitalRecord(db.Model):
             'oxygen_saturation': self.oxygen_saturation,
             'weight': self.weight,
             'notes': self.notes,
-            'measured_at': self.measured_at.isoformat() if self.measured_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'measured_at': self.measured_at,
+            'created_at': self.created_at
         }
 
     def __repr__(self):
@@ -330,6 +355,12 @@ class VitalRecord(db.Model):
 class Reminder(db.Model):
     """User health reminders"""
     __tablename__ = 'reminders'
+    __table_args__ = (
+        # Matches get_reminders: equality filters first, then the sort key
+        db.Index('ix_reminders_user_active_complete', 'user_id', 'is_active', 'is_completed', 'scheduled_time'),
+        # Same for ?completed=true, which does not filter on is_completed
+        db.Index('ix_reminders_user_active_time', 'user_id', 'is_active', 'scheduled_time'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
@@ -359,22 +390,54 @@ class Reminder(db.Model):
             'message': self.message,
             'reminder_type': self.reminder_type,
             'priority': self.priority,
-            'scheduled_time': self.scheduled_time.isoformat() if self.scheduled_time else None,
+            'scheduled_time': self.scheduled_time,
             'repeat_type': self.repeat_type,
             'is_completed': self.is_completed,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'completed_at': self.completed_at,
             'is_active': self.is_active,
             'remedy': self.remedy.to_dict() if self.remedy else None,
             'diet_plan': self.diet_plan.to_dict() if self.diet_plan else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
     def __repr__(self):
         return f'<Reminder {self.title}>'
 
 
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune every new SQLite connection for concurrent reads and writes"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers proceed while reminders/vitals are being written
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA cache_size=-64000')  # 64 MB page cache
+    cursor.close()
+
+
 def init_db(app):
     """Initialize database with app context"""
     db.init_app(app)
     with app.app_context():
+        had_frequencies = inspect(db.engine).has_table(SymptomFrequency.__tablename__)
         db.create_all()
+        # create_all() skips tables that already exist, so indexes added
+        # after a database was first created are created here
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(db.engine, checkfirst=True)
+
+        # Databases created before symptom_frequencies existed get their
+        # counts rebuilt once from the stored history
+        if not had_frequencies:
+            db.session.execute(text(
+                "INSERT INTO symptom_frequencies (user_id, symptom, count) "
+                "SELECT symptom_records.user_id, lower(symptom.value), COUNT(*) "
+                "FROM symptom_records, json_each(symptom_records.symptoms) AS symptom "
+                "WHERE json_valid(symptom_records.symptoms) "
+                "GROUP BY symptom_records.user_id, lower(symptom.value)"
+            ))
+            db.session.commit()
@@ -3,10 +3,19 @@ Recommendation Engine for Smart Health Management System
 Uses data structures to provide diet plans and home remedy recommendations
 """
 
+import glob
+import hashlib
 import json
 import os
+import threading
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # no orjson wheels for PyPy; fall back to the stdlib parser
+    orjson = None
+
 from data_structures import (
-    SymptomHashTable,
     SymptomTrie,
     RecommendationBST,
     HealthGraph,
@@ -14,10 +23,20 @@ from data_structures import (
 )
 
 
+# Pickled symptom tries, named by a digest of the data they were built from
+CACHE_DIR = os.path.join(os.path.dirname(__file__), 'data', 'cache')
+
+# Joins an item's lowercased ingredients/foods into one searchable string;
+# a query containing it could match across two entries, so none may
+SEARCH_TEXT_SEPARATOR = '\n'
+
+# Distinct symptom lists whose recommendations are kept in memory
+RECOMMENDATION_CACHE_SIZE = 1024
+
+
 class RecommendationEngine:
     def __init__(self):
         # Initialize data structures
-        self.symptom_hash = SymptomHashTable()
         self.symptom_trie = SymptomTrie()
         self.remedy_bst = RecommendationBST()
         self.diet_bst = RecommendationBST()
@@ -29,6 +48,20 @@ class RecommendationEngine:
         self.remedies_data = []
         self.diet_plans_data = []
 
+        # (item, joined lowercase ingredients/foods) for substring search
+        self._remedy_search_text = []
+        self._diet_search_text = []
+
+        # Lowercased name -> first remedy/diet plan with that name
+        self._remedy_by_name = {}
+        self._diet_by_name = {}
+
+        # Recommendations only depend on the (static) loaded data, so they
+        # are memoized per normalized symptom tuple
+        self._cached_recommendations = lru_cache(maxsize=RECOMMENDATION_CACHE_SIZE)(
+            self._compute_recommendations
+        )
+
         # Load data on initialization
         self._load_data()
 
@@ -37,8 +70,10 @@ class RecommendationEngine:
         data_path = os.path.join(os.path.dirname(__file__), 'data', 'health_data.json')
 
         try:
-            with open(data_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(data_path, 'rb') as f:
+                raw = f.read()
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
             self.symptoms_data = data.get('symptoms', [])
             self.remedies_data = data.get('home_remedies', [])
@@ -52,17 +87,14 @@ class RecommendationEngine:
 
     def _build_data_structures(self):
         """Build all data structures from loaded data"""
-        # Build symptom trie and hash table
+        # Symptom trie for autocomplete, from the on-disk cache when the
+        # symptom data is unchanged
+        self.symptom_trie = self._load_or_build_symptom_trie()
+
+        # Build symptom graph
         for symptom in self.symptoms_data:
             symptom_name = symptom['name'].lower()
 
-            # Add to trie for autocomplete
-            self.symptom_trie.insert_symptom(
-                symptom_name,
-                severity_range=symptom.get('severity_range'),
-                category=symptom.get('category')
-            )
-
             # Add to graph
             self.health_graph.add_symptom(symptom_name, symptom)
 
@@ -71,9 +103,14 @@ class RecommendationEngine:
                 self.health_graph.add_symptom(related.lower())
                 self.health_graph.link_related_symptoms(symptom_name, related.lower())
 
-        # Build remedy hash table and BST
+        # Build remedy indexes, BST and graph links
         for remedy in self.remedies_data:
             remedy_name = remedy['name']
+            self._remedy_by_name.setdefault(remedy_name.lower(), remedy)
+            self._remedy_search_text.append((
+                remedy,
+                SEARCH_TEXT_SEPARATOR.join(ing.lower() for ing in remedy.get('ingredients', []))
+            ))
 
             # Add to BST sorted by effectiveness
             self.remedy_bst.add_recommendation(
@@ -86,11 +123,6 @@ class RecommendationEngine:
 
             for symptom in remedy.get('symptoms', []):
                 symptom_lower = symptom.lower()
-                # Add to hash table for O(1) lookup
-                self.symptom_hash.add_remedy(symptom_lower, {
-                    'type': 'remedy',
-                    'data': remedy
-                })
                 # Add to graph
                 self.health_graph.add_symptom(symptom_lower)
                 self.health_graph.link_symptom_to_remedy(
@@ -99,9 +131,14 @@ class RecommendationEngine:
                     effectiveness=remedy.get('effectiveness', 5)
                 )
 
-        # Build diet plan BST
+        # Build diet plan indexes, BST and graph links
         for diet in self.diet_plans_data:
             diet_name = diet['name']
+            self._diet_by_name.setdefault(diet_name.lower(), diet)
+            self._diet_search_text.append((
+                diet,
+                SEARCH_TEXT_SEPARATOR.join(f.lower() for f in diet.get('foods_to_eat', []))
+            ))
 
             # Add to BST sorted by effectiveness
             self.diet_bst.add_recommendation(
@@ -114,11 +151,6 @@ class RecommendationEngine:
 
             for symptom in diet.get('symptoms', []):
                 symptom_lower = symptom.lower()
-                # Add to hash table
-                self.symptom_hash.add_remedy(symptom_lower, {
-                    'type': 'diet',
-                    'data': diet
-                })
                 # Add to graph
                 self.health_graph.add_symptom(symptom_lower)
                 self.health_graph.link_symptom_to_diet(
@@ -127,6 +159,44 @@ class RecommendationEngine:
                     effectiveness=diet.get('effectiveness', 5)
                 )
 
+        # The knowledge base is fixed from here on; snapshot the graph into
+        # flat arrays for recommendation scoring (the trie comes frozen)
+        self.health_graph.freeze()
+
+    def _load_or_build_symptom_trie(self):
+        """Load the frozen symptom trie from cache, or build and cache it"""
+        entries = [
+            (symptom['name'].lower(), symptom.get('severity_range'), symptom.get('category'))
+            for symptom in self.symptoms_data
+        ]
+        digest = hashlib.blake2b(
+            json.dumps([SymptomTrie.PICKLE_VERSION, entries]).encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+        cache_path = os.path.join(CACHE_DIR, f'symptom_trie-{digest}.pkl')
+
+        try:
+            return SymptomTrie.load(cache_path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:  # A damaged pickle can fail in almost any way
+            print(f"Warning: Ignoring unreadable trie cache {cache_path}: {e}")
+
+        trie = SymptomTrie()
+        trie.bulk_insert_symptoms(entries)
+        trie.freeze()
+
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            trie.save(cache_path)
+            # Caches for older versions of the data are never read again
+            for stale in glob.glob(os.path.join(CACHE_DIR, 'symptom_trie-*.pkl')):
+                if stale != cache_path:
+                    os.remove(stale)
+        except OSError as e:
+            print(f"Warning: Could not write trie cache {cache_path}: {e}")
+        return trie
+
     def autocomplete_symptoms(self, prefix, max_results=10):
         """Get symptom suggestions based on prefix"""
         return self.symptom_trie.autocomplete(prefix, max_results)
@@ -142,7 +212,7 @@ class RecommendationEngine:
         Returns:
             Dictionary with remedies and diet plans
         """
-        symptoms_lower = [s.lower().strip() for s in symptoms if s.strip()]
+        symptoms_lower = tuple(s.lower().strip() for s in symptoms if s.strip())
 
         if not symptoms_lower:
             return {
@@ -151,38 +221,37 @@ class RecommendationEngine:
                 'related_symptoms': []
             }
 
+        recommendations, remedies_count, diets_count = self._cached_recommendations(symptoms_lower)
+
+        # Record in history
+        self.symptom_history.add_symptom_record(
+            list(symptoms_lower),
+            severity,
+            {
+                'remedies_count': remedies_count,
+                'diets_count': diets_count
+            }
+        )
+
+        # Fresh lists so callers cannot alter the cached entry; the item
+        # dicts themselves are shared and must be treated as read-only
+        return {key: list(items) for key, items in recommendations.items()}
+
+    def _compute_recommendations(self, symptoms_lower):
+        """
+        Rank remedies, diet plans and related symptoms for a symptom tuple
+
+        Returns:
+            (recommendations, total remedies found, total diet plans found)
+        """
         # Use graph to get comprehensive recommendations
         graph_recommendations = self.health_graph.get_recommendations_for_symptoms(symptoms_lower)
 
-        # Also use hash table for quick lookup
-        hash_remedies = {}
-        hash_diets = {}
-
-        for symptom in symptoms_lower:
-            results = self.symptom_hash.get_remedies(symptom)
-            for item in results:
-                if item['type'] == 'remedy':
-                    name = item['data']['name']
-                    if name not in hash_remedies:
-                        hash_remedies[name] = {
-                            'data': item['data'],
-                            'match_count': 0
-                        }
-                    hash_remedies[name]['match_count'] += 1
-                elif item['type'] == 'diet':
-                    name = item['data']['name']
-                    if name not in hash_diets:
-                        hash_diets[name] = {
-                            'data': item['data'],
-                            'match_count': 0
-                        }
-                    hash_diets[name]['match_count'] += 1
-
-        # Combine and rank remedies
+        # Rank remedies
         remedies = []
         seen_remedies = set()
 
-        # Add from graph first (already sorted by effectiveness and matches)
+        # Graph results are already ranked by matches then score
         for r in graph_recommendations.get('remedies', []):
             if r['name'] not in seen_remedies:
                 remedy_data = r['data'] if r['data'] else self._find_remedy_by_name(r['name'])
@@ -194,19 +263,10 @@ class RecommendationEngine:
                     })
                     seen_remedies.add(r['name'])
 
-        # Add any from hash table that might have been missed
-        for name, info in hash_remedies.items():
-            if name not in seen_remedies:
-                remedies.append({
-                    **info['data'],
-                    'match_count': info['match_count'],
-                    'relevance_score': info['data'].get('effectiveness', 5) * info['match_count']
-                })
-
         # Sort remedies by match count then effectiveness
         remedies.sort(key=lambda x: (x['match_count'], x.get('effectiveness', 5)), reverse=True)
 
-        # Combine and rank diet plans
+        # Rank diet plans
         diet_plans = []
         seen_diets = set()
 
@@ -221,14 +281,6 @@ class RecommendationEngine:
                     })
                     seen_diets.add(d['name'])
 
-        for name, info in hash_diets.items():
-            if name not in seen_diets:
-                diet_plans.append({
-                    **info['data'],
-                    'match_count': info['match_count'],
-                    'relevance_score': info['data'].get('effectiveness', 5) * info['match_count']
-                })
-
         diet_plans.sort(key=lambda x: (x['match_count'], x.get('effectiveness', 5)), reverse=True)
 
         # Get related symptoms
@@ -239,35 +291,20 @@ class RecommendationEngine:
                 if r['symptom'] not in symptoms_lower:
                     related_symptoms.add(r['symptom'])
 
-        # Record in history
-        self.symptom_history.add_symptom_record(
-            symptoms_lower,
-            severity,
-            {
-                'remedies_count': len(remedies),
-                'diets_count': len(diet_plans)
-            }
-        )
-
-        return {
+        recommendations = {
             'remedies': remedies[:10],  # Top 10 remedies
             'diet_plans': diet_plans[:5],  # Top 5 diet plans
             'related_symptoms': list(related_symptoms)[:10]
         }
+        return recommendations, len(remedies), len(diet_plans)
 
     def _find_remedy_by_name(self, name):
         """Find remedy data by name"""
-        for remedy in self.remedies_data:
-            if remedy['name'].lower() == name.lower():
-                return remedy
-        return None
+        return self._remedy_by_name.get(name.lower())
 
     def _find_diet_by_name(self, name):
         """Find diet plan data by name"""
-        for diet in self.diet_plans_data:
-            if diet['name'].lower() == name.lower():
-                return diet
-        return None
+        return self._diet_by_name.get(name.lower())
 
     def get_all_symptoms(self):
         """Get all available symptoms"""
@@ -299,40 +336,33 @@ class RecommendationEngine:
 
     def search_by_ingredient(self, ingredient):
         """Search remedies by ingredient"""
-        results = []
-        ingredient_lower = ingredient.lower()
-
-        for remedy in self.remedies_data:
-            ingredients = remedy.get('ingredients', [])
-            for ing in ingredients:
-                if ingredient_lower in ing.lower():
-                    results.append(remedy)
-                    break
-
-        return results
+        return self._search_text(self._remedy_search_text, ingredient)
 
     def search_by_food(self, food):
         """Search diet plans by food"""
-        results = []
-        food_lower = food.lower()
-
-        for diet in self.diet_plans_data:
-            foods_to_eat = diet.get('foods_to_eat', [])
-            for f in foods_to_eat:
-                if food_lower in f.lower():
-                    results.append(diet)
-                    break
+        return self._search_text(self._diet_search_text, food)
 
-        return results
+    @staticmethod
+    def _search_text(search_text, query):
+        """Items with an ingredient/food containing query (case-insensitive)"""
+        query = query.lower()
+        if SEARCH_TEXT_SEPARATOR in query:
+            return []
+        return [item for item, text in search_text if query in text]
 
 
 # Singleton instance
 _engine_instance = None
+_engine_lock = threading.Lock()
 
 
 def get_recommendation_engine():
     """Get or create the recommendation engine instance"""
     global _engine_instance
     if _engine_instance is None:
-        _engine_instance = RecommendationEngine()
+        # Only the first callers take the lock; the check inside keeps
+        # threads racing on startup from each building an engine
+        with _engine_lock:
+            if _engine_instance is None:
+                _engine_instance = RecommendationEngine()
     return _engine_instance
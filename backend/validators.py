@@ -5,6 +5,7 @@ Protects against XSS, SQL Injection, and other security threats
 
 import re
 import html
+from datetime import datetime
 from functools import wraps
 from flask import request, jsonify
 
@@ -25,17 +26,51 @@ class Validator:
     USERNAME_PATTERN = re.compile(r'^[a-zA-Z0-9_]{3,30}$')
     NAME_PATTERN = re.compile(r'^[a-zA-Z\s\-]{1,50}$')
 
-    # Dangerous patterns for XSS prevention
-    XSS_PATTERNS = [
-        re.compile(r'<script.*?>.*?</script>', re.IGNORECASE | re.DOTALL),
-        re.compile(r'javascript:', re.IGNORECASE),
-        re.compile(r'on\w+\s*=', re.IGNORECASE),
-        re.compile(r'<iframe.*?>', re.IGNORECASE),
-        re.compile(r'<object.*?>', re.IGNORECASE),
-        re.compile(r'<embed.*?>', re.IGNORECASE),
-        re.compile(r'<link.*?>', re.IGNORECASE),
-        re.compile(r'expression\s*\(', re.IGNORECASE),
-    ]
+    # Password strength patterns
+    LOWERCASE_PATTERN = re.compile(r'[a-z]')
+    UPPERCASE_PATTERN = re.compile(r'[A-Z]')
+    DIGIT_PATTERN = re.compile(r'\d')
+
+    # Dangerous patterns for XSS prevention, as one alternation so a clean
+    # value is checked in a single scan instead of one scan per pattern.
+    # The lookahead on the branches' first characters lets the scan skip
+    # other positions without trying every branch
+    XSS_PATTERN = re.compile(
+        r'(?=[<joe])(?:'
+        r'<script.*?>.*?</script>'
+        r'|javascript:'
+        r'|on\w+\s*='
+        r'|<(?:iframe|object|embed|link).*?>'
+        r'|expression\s*\()',
+        re.IGNORECASE | re.DOTALL
+    )
+
+    # Patterns for sanitize_html. A dangerous tag is removed with its content
+    # up to the matching close tag, or on its own when it is self-closing,
+    # void or never closed; one alternation covers every tag in one scan
+    DANGEROUS_TAGS = 'script|iframe|object|embed|link|style|meta'
+    DANGEROUS_TAG_PATTERN = re.compile(
+        rf'<({DANGEROUS_TAGS})[^>]*>.*?</\1>|<(?:{DANGEROUS_TAGS})[^>]*/?>',
+        re.IGNORECASE | re.DOTALL
+    )
+    EVENT_HANDLER_PATTERN = re.compile(
+        r'\s+on\w+\s*=\s*(?:"[^"]*"|\'[^\']*\'|\S+)', re.IGNORECASE
+    )
+    JAVASCRIPT_URL_PATTERN = re.compile(r'javascript:[^"\']*', re.IGNORECASE)
+
+    # strptime fallbacks for datetimes fromisoformat rejects (e.g. unpadded fields)
+    DATETIME_FORMATS = (
+        '%Y-%m-%dT%H:%M:%S',
+        '%Y-%m-%dT%H:%M:%S.%f',
+        '%Y-%m-%dT%H:%M',
+        '%Y-%m-%d %H:%M:%S',
+        '%Y-%m-%d %H:%M',
+        '%Y-%m-%d',
+    )
+
+    # Reminder choices
+    REMINDER_TYPES = ('general', 'diet', 'remedy', 'checkup', 'medication', 'exercise')
+    REPEAT_TYPES = ('none', 'daily', 'weekly', 'monthly')
 
     @staticmethod
     def sanitize_string(value, max_length=500):
@@ -58,9 +93,11 @@ class Validator:
         # HTML escape to prevent XSS
         value = html.escape(value)
 
-        # Remove dangerous patterns
-        for pattern in Validator.XSS_PATTERNS:
-            value = pattern.sub('', value)
+        # Remove dangerous patterns, repeating in case a removal joined the
+        # surrounding text into a new match
+        removed = True
+        while removed:
+            value, removed = Validator.XSS_PATTERN.subn('', value)
 
         return value
 
@@ -78,18 +115,15 @@ class Validator:
 
         value = value.strip()[:max_length]
 
-        # Remove dangerous tags
-        dangerous_tags = ['script', 'iframe', 'object', 'embed', 'link', 'style', 'meta']
-        for tag in dangerous_tags:
-            value = re.sub(f'<{tag}[^>]*>.*?</{tag}>', '', value, flags=re.IGNORECASE | re.DOTALL)
-            value = re.sub(f'<{tag}[^>]*/>', '', value, flags=re.IGNORECASE)
-
-        # Remove event handlers
-        value = re.sub(r'\s+on\w+\s*=\s*["\'][^"\']*["\']', '', value, flags=re.IGNORECASE)
-        value = re.sub(r'\s+on\w+\s*=\s*\S+', '', value, flags=re.IGNORECASE)
-
-        # Remove javascript: URLs
-        value = re.sub(r'javascript:[^"\']*', '', value, flags=re.IGNORECASE)
+        # Remove dangerous tags, event handlers and javascript: URLs,
+        # repeating in case a removal joined the surrounding text into
+        # something dangerous
+        removed = True
+        while removed:
+            value, tags = Validator.DANGEROUS_TAG_PATTERN.subn('', value)
+            value, handlers = Validator.EVENT_HANDLER_PATTERN.subn('', value)
+            value, urls = Validator.JAVASCRIPT_URL_PATTERN.subn('', value)
+            removed = tags or handlers or urls
 
         return value
 
@@ -141,13 +175,13 @@ class Validator:
             raise ValidationError("Password is too long (max 128 characters)", "password")
 
         # Check for at least one lowercase, uppercase, digit
-        if not re.search(r'[a-z]', password):
+        if not Validator.LOWERCASE_PATTERN.search(password):
             raise ValidationError("Password must contain at least one lowercase letter", "password")
 
-        if not re.search(r'[A-Z]', password):
+        if not Validator.UPPERCASE_PATTERN.search(password):
             raise ValidationError("Password must contain at least one uppercase letter", "password")
 
-        if not re.search(r'\d', password):
+        if not Validator.DIGIT_PATTERN.search(password):
             raise ValidationError("Password must contain at least one digit", "password")
 
         return password
@@ -233,52 +267,42 @@ class Validator:
         if not sanitized:
             raise ValidationError("At least one valid symptom is required", "symptoms")
 
-        return list(set(sanitized))  # Remove duplicates
+        return list(dict.fromkeys(sanitized))  # Remove duplicates, keeping input order
 
     @staticmethod
     def validate_datetime(value, field_name="datetime"):
         """Validate and parse datetime string"""
-        from datetime import datetime as dt
-
         if not value:
             return None
 
-        # Try common formats
-        formats = [
-            '%Y-%m-%dT%H:%M:%S',
-            '%Y-%m-%dT%H:%M:%S.%f',
-            '%Y-%m-%dT%H:%M',
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%d %H:%M',
-            '%Y-%m-%d',
-        ]
-
-        for fmt in formats:
-            try:
-                return dt.strptime(value, fmt)
-            except ValueError:
-                continue
-
-        # Try ISO format
+        # ISO format first: it is parsed in C and covers what clients send
         try:
-            return dt.fromisoformat(value.replace('Z', '+00:00'))
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
         except ValueError:
             pass
 
+        # Then the other common formats
+        for fmt in Validator.DATETIME_FORMATS:
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+
         raise ValidationError(f"Invalid {field_name} format", field_name)
 
     @staticmethod
     def validate_reminder_type(reminder_type):
         """Validate reminder type"""
-        valid_types = ['general', 'diet', 'remedy', 'checkup', 'medication', 'exercise']
-
         if not reminder_type:
             return 'general'
 
         reminder_type = reminder_type.lower().strip()
 
-        if reminder_type not in valid_types:
-            raise ValidationError(f"Invalid reminder type. Must be one of: {', '.join(valid_types)}", "reminder_type")
+        if reminder_type not in Validator.REMINDER_TYPES:
+            raise ValidationError(
+                f"Invalid reminder type. Must be one of: {', '.join(Validator.REMINDER_TYPES)}",
+                "reminder_type"
+            )
 
         return reminder_type
 
@@ -289,6 +313,54 @@ class Validator:
             return 5
         return Validator.validate_integer(priority, min_val=1, max_val=10, field_name="priority")
 
+    @staticmethod
+    def validate_reminder(data, partial=False):
+        """
+        Validate a reminder payload in one pass
+
+        Args:
+            data: Request JSON body
+            partial: Only validate the fields present (for updates)
+
+        Returns:
+            Dict of cleaned column values
+        """
+        cleaned = {}
+
+        if not partial or 'title' in data:
+            cleaned['title'] = Validator.sanitize_string(data.get('title', ''), 200)
+            if not cleaned['title'] and not partial:
+                raise ValidationError("Title is required", "title")
+
+        if not partial or 'message' in data:
+            cleaned['message'] = Validator.sanitize_string(data.get('message', ''), 1000)
+            if not cleaned['message'] and not partial:
+                raise ValidationError("Message is required", "message")
+
+        if not partial or 'reminder_type' in data:
+            cleaned['reminder_type'] = Validator.validate_reminder_type(data.get('reminder_type'))
+
+        if not partial or 'priority' in data:
+            cleaned['priority'] = Validator.validate_priority(data.get('priority'))
+
+        if not partial or 'scheduled_time' in data:
+            cleaned['scheduled_time'] = Validator.validate_datetime(data.get('scheduled_time'), 'scheduled_time')
+            if not cleaned['scheduled_time'] and not partial:
+                raise ValidationError("Scheduled time is required", "scheduled_time")
+
+        if not partial or 'repeat_type' in data:
+            repeat_type = data.get('repeat_type')
+            if repeat_type and repeat_type not in Validator.REPEAT_TYPES:
+                repeat_type = 'none'
+            cleaned['repeat_type'] = repeat_type
+
+        if partial:
+            for flag in ('is_completed', 'is_active'):
+                if flag in data:
+                    cleaned[flag] = bool(data[flag])
+
+        return cleaned
+
 
 def validate_json_request(required_fields=None, optional_fields=None):
     """
@@ -332,78 +404,3 @@ def handle_validation_error(f):
                 'field': e.field
             }), 400
     return wrapper
-
-
-class RateLimiter:
-    """Simple in-memory rate limiter"""
-
-    def __init__(self):
-        self.requests = {}  # {ip: [(timestamp, endpoint), ...]}
-
-    def is_rate_limited(self, ip, endpoint, max_requests=100, window_seconds=60):
-        """
-        Check if request should be rate limited
-
-        Args:
-            ip: Client IP address
-            endpoint: API endpoint
-            max_requests: Maximum requests allowed in window
-            window_seconds: Time window in seconds
-
-        Returns:
-            True if rate limited, False otherwise
-        """
-        from datetime import datetime, timedelta
-
-        key = f"{ip}:{endpoint}"
-        now = datetime.utcnow()
-        cutoff = now - timedelta(seconds=window_seconds)
-
-        # Clean old entries
-        if key in self.requests:
-            self.requests[key] = [
-                ts for ts in self.requests[key]
-                if ts > cutoff
-            ]
-        else:
-            self.requests[key] = []
-
-        # Check rate limit
-        if len(self.requests[key]) >= max_requests:
-            return True
-
-        # Add current request
-        self.requests[key].append(now)
-        return False
-
-    def clear(self):
-        """Clear all rate limit data"""
-        self.requests = {}
-
-
-# Global rate limiter instance
-rate_limiter = RateLimiter()
-
-
-def rate_limit(max_requests=100, window_seconds=60):
-    """
-    Decorator for rate limiting endpoints
-
-    Args:
-        max_requests: Maximum requests allowed in window
-        window_seconds: Time window in seconds
-    """
-    def decorator(f):
-        @wraps(f)
-        def wrapper(*args, **kwargs):
-            ip = request.remote_addr or 'unknown'
-            endpoint = request.endpoint or request.path
-
-            if rate_limiter.is_rate_limited(ip, endpoint, max_requests, window_seconds):
-                return jsonify({
-                    'error': 'Rate limit exceeded. Please try again later.'
-                }), 429
-
-            return f(*args, **kwargs)
-        return wrapper
-    return decorator
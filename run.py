@@ -3,11 +3,19 @@ Smart Health Management System
 Run this file to start the application
 
 Usage: python run.py
+       USE_GEVENT=1 python run.py   (cooperative gevent server)
 """
 
 import os
 import sys
 
+USE_GEVENT = os.environ.get('USE_GEVENT') == '1'
+
+if USE_GEVENT:
+    # Must run before anything imports sockets, threads or sqlite
+    from gevent import monkey
+    monkey.patch_all()
+
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
@@ -33,4 +41,8 @@ if __name__ == '__main__':
     print("[*] Open your browser and go to: http://localhost:5000")
     print("=" * 60 + "\n")
 
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    if USE_GEVENT:
+        from gevent.pywsgi import WSGIServer
+        WSGIServer(('0.0.0.0', 5000), app).serve_forever()
+    else:
+        app.run(debug=True, host='0.0.0.0', port=5000)
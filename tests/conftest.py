@@ -0,0 +1,100 @@
+"""
+Shared fixtures for the data structure tests
+Read-only tests share one prebuilt instance per module; tests that mutate
+a structure still build their own
+"""
+
+import random
+import string
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make the backend packages importable for every test module; conftest is
+# imported once per session, before any test module is collected
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from data_structures import HashTable, SymptomHashTable, Trie, Graph, HealthGraph
+
+
+@pytest.fixture(scope="module")
+def populated_hash_table():
+    """HashTable holding key1 -> value1 and key2 -> value2"""
+    ht = HashTable()
+    ht.insert("key1", "value1")
+    ht.insert("key2", "value2")
+    return ht
+
+
+@pytest.fixture(scope="module")
+def populated_trie():
+    """Trie holding hello, help, helmet and world"""
+    trie = Trie()
+    for word in ("hello", "help", "helmet", "world"):
+        trie.insert(word)
+    return trie
+
+
+@pytest.fixture(scope="module")
+def populated_graph():
+    """Graph with edges A-B, A-C and B-D"""
+    g = Graph()
+    for node in ("A", "B", "C", "D"):
+        g.add_node(node)
+    g.add_edge("A", "B")
+    g.add_edge("A", "C")
+    g.add_edge("B", "D")
+    return g
+
+
+@pytest.fixture(scope="module")
+def health_graph():
+    """
+    HealthGraph with headache, nausea and migraine; Ginger Tea linked to
+    headache (8) and nausea (9), Light Diet to headache (7), and
+    headache related to migraine
+    """
+    hg = HealthGraph()
+    hg.add_symptom("headache", {"category": "neurological"})
+    hg.add_symptom("nausea")
+    hg.add_symptom("migraine")
+    hg.add_remedy("Ginger Tea", {"effectiveness": 8})
+    hg.add_diet_plan("Light Diet")
+    hg.link_symptom_to_remedy("headache", "Ginger Tea", effectiveness=8)
+    hg.link_symptom_to_remedy("nausea", "Ginger Tea", effectiveness=9)
+    hg.link_symptom_to_diet("headache", "Light Diet", effectiveness=7)
+    hg.link_related_symptoms("headache", "migraine")
+    return hg
+
+
+# ==================== Benchmark Fixtures ====================
+
+@pytest.fixture(scope="session")
+def word_corpus():
+    """10 000 distinct pseudo-words, the same on every run; about 1 in 20 starts with "pre" """
+    rng = random.Random(0)
+    words = {}
+    while len(words) < 10_000:
+        word = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+        if rng.random() < 0.05:
+            word = 'pre' + word
+        words[word] = None
+    return tuple(words)
+
+
+@pytest.fixture(scope="session")
+def big_trie(word_corpus):
+    """Trie holding the whole word corpus"""
+    trie = Trie()
+    trie.bulk_insert(word_corpus)
+    return trie
+
+
+@pytest.fixture(scope="session")
+def big_symptom_table(word_corpus):
+    """SymptomHashTable with one remedy per corpus word"""
+    sht = SymptomHashTable()
+    for word in word_corpus:
+        sht.add_remedy(word, {"name": word})
+    return sht
@@ -3,13 +3,18 @@ Unit Tests for Data Structures
 Tests Hash Table, Trie, BST, Graph, and Queue implementations
 """
 
-import pytest
-import sys
-import os
+import heapq
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from math import log2
+from operator import itemgetter
+from types import MappingProxyType
 
-# Add backend to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+import pytest
+from hypothesis import given, settings, strategies as st
 
+# backend/ is put on sys.path by conftest.py
 from data_structures import (
     HashTable, SymptomHashTable,
     Trie, SymptomTrie,
@@ -19,24 +24,63 @@ from data_structures import (
 )
 
 
+# ==================== Shared Inputs ====================
+
+# Built once at import instead of formatted inside each test
+TEST_WORDS = tuple(f"test{i}" for i in range(10))
+SYMPTOM_NAMES = tuple(f"symptom{i}" for i in range(10))
+# (symptoms, severity, recommendations) arguments for add_symptom_record;
+# the read-only empty mapping is shared, so the queue must not mutate it
+EMPTY_RECOMMENDATIONS = MappingProxyType({})
+HISTORY_BATCH = tuple(
+    ((symptom,), 5, EMPTY_RECOMMENDATIONS) for symptom in SYMPTOM_NAMES
+)
+# Enough keys to overflow every size in TABLE_SIZES and force resizes
+COLLISION_KEYS = tuple(f"k{i}" for i in range(32))
+
+
+# ==================== Parametrized Cases ====================
+
+# (key, expected value) lookups against populated_hash_table
+HASH_TABLE_LOOKUPS = [
+    pytest.param("key1", "value1", id="key1"),
+    pytest.param("key2", "value2", id="key2"),
+    pytest.param("nonexistent", None, id="missing"),
+]
+
+# Items enqueued before checking size() and is_empty()
+QUEUE_CONTENTS = [
+    pytest.param((), id="empty"),
+    pytest.param((1,), id="one"),
+    pytest.param((1, 2), id="two"),
+]
+
+# Starting table sizes for the collision test; small sizes force long
+# probe runs and repeated resizing
+TABLE_SIZES = [1, 2, 4, 16]
+
+
+# ==================== Expected Results ====================
+
+# Subsets of result dicts, checked with `expected.items() <= result.items()`
+# so a failure shows the whole result rather than one field
+EXPECTED_HEADACHE_DATA = {"word": "headache", "category": "neurological"}
+EXPECTED_GINGER_TEA_LINK = {"name": "Ginger Tea", "effectiveness": 8}
+EXPECTED_DIET_REMINDER = {"type": "diet", "time": "08:00"}
+EXPECTED_REMEDY_REMINDER = {"type": "remedy", "time": "09:00"}
+
+
 # ==================== Hash Table Tests ====================
 
+@pytest.mark.xdist_group(name="hash_table")
 class TestHashTable:
     """Tests for basic HashTable implementation"""
 
-    def test_insert_and_get(self):
-        """Test basic insert and retrieval"""
-        ht = HashTable()
-        ht.insert("key1", "value1")
-        ht.insert("key2", "value2")
-
-        assert ht.get("key1") == "value1"
-        assert ht.get("key2") == "value2"
-
-    def test_get_nonexistent_key(self):
-        """Test getting a key that doesn't exist"""
-        ht = HashTable()
-        assert ht.get("nonexistent") is None
+    @pytest.mark.parametrize("key, expected", HASH_TABLE_LOOKUPS)
+    def test_get_and_contains(self, populated_hash_table, key, expected):
+        """Test retrieval and membership of present and missing keys"""
+        assert populated_hash_table.get(key) == expected
+        assert populated_hash_table.contains(key) is (expected is not None)
 
     def test_update_existing_key(self):
         """Test updating an existing key"""
@@ -54,47 +98,30 @@ class TestHashTable:
 
         assert ht.get("key1") is None
 
-    def test_contains(self):
-        """Test contains method"""
-        ht = HashTable()
-        ht.insert("key1", "value1")
-
-        assert ht.contains("key1") is True
-        assert ht.contains("key2") is False
-
-    def test_keys(self):
+    def test_keys(self, populated_hash_table):
         """Test getting all keys"""
-        ht = HashTable()
-        ht.insert("key1", "value1")
-        ht.insert("key2", "value2")
-
-        keys = ht.keys()
-        assert "key1" in keys
-        assert "key2" in keys
+        keys = populated_hash_table.keys()
         assert len(keys) == 2
+        assert set(keys) == {"key1", "key2"}
 
-    def test_values(self):
+    def test_values(self, populated_hash_table):
         """Test getting all values"""
-        ht = HashTable()
-        ht.insert("key1", "value1")
-        ht.insert("key2", "value2")
-
-        values = ht.values()
-        assert "value1" in values
-        assert "value2" in values
+        values = populated_hash_table.values()
+        assert set(values) == {"value1", "value2"}
 
-    def test_collision_handling(self):
+    @pytest.mark.parametrize("size", TABLE_SIZES)
+    def test_collision_handling(self, size):
         """Test that collisions are handled properly"""
-        ht = HashTable(size=1)  # Force collisions
-        ht.insert("key1", "value1")
-        ht.insert("key2", "value2")
-        ht.insert("key3", "value3")
+        ht = HashTable(size=size)  # Small tables force collisions
+        for i, key in enumerate(COLLISION_KEYS):
+            ht.insert(key, i)
 
-        assert ht.get("key1") == "value1"
-        assert ht.get("key2") == "value2"
-        assert ht.get("key3") == "value3"
+        for i, key in enumerate(COLLISION_KEYS):
+            assert ht.get(key) == i
+        assert ht.count == len(COLLISION_KEYS)
 
 
+@pytest.mark.xdist_group(name="hash_table")
 class TestSymptomHashTable:
     """Tests for SymptomHashTable specialized implementation"""
 
@@ -125,53 +152,63 @@ class TestSymptomHashTable:
 
 # ==================== Trie Tests ====================
 
+@pytest.mark.xdist_group(name="trie")
 class TestTrie:
     """Tests for basic Trie implementation"""
 
-    def test_insert_and_search(self):
+    def test_insert_and_search(self, populated_trie):
         """Test basic insert and search"""
-        trie = Trie()
-        trie.insert("hello")
-        trie.insert("world")
+        assert populated_trie.search("hello") is True
+        assert populated_trie.search("world") is True
+        assert populated_trie.search("hell") is False
 
-        assert trie.search("hello") is True
-        assert trie.search("world") is True
-        assert trie.search("hell") is False
-
-    def test_starts_with(self):
+    def test_starts_with(self, populated_trie):
         """Test prefix checking"""
-        trie = Trie()
-        trie.insert("hello")
-        trie.insert("help")
-        trie.insert("world")
+        assert populated_trie.starts_with("hel") is True
+        assert populated_trie.starts_with("wor") is True
+        assert populated_trie.starts_with("xyz") is False
 
-        assert trie.starts_with("hel") is True
-        assert trie.starts_with("wor") is True
-        assert trie.starts_with("xyz") is False
-
-    def test_autocomplete(self):
+    def test_autocomplete(self, populated_trie):
         """Test autocomplete functionality"""
-        trie = Trie()
-        trie.insert("hello")
-        trie.insert("help")
-        trie.insert("helmet")
-        trie.insert("world")
-
-        results = trie.autocomplete("hel")
+        results = populated_trie.autocomplete("hel")
         assert len(results) == 3
-        assert "hello" in results
-        assert "help" in results
-        assert "helmet" in results
+        assert set(results) == {"hello", "help", "helmet"}
 
     def test_autocomplete_max_results(self):
         """Test autocomplete with max results"""
         trie = Trie()
-        for i in range(10):
-            trie.insert(f"test{i}")
+        for word in TEST_WORDS:
+            trie.insert(word)
 
         results = trie.autocomplete("test", max_results=5)
         assert len(results) == 5
 
+    def test_autocomplete_by_frequency(self):
+        """Test autocomplete returns the most searched words first"""
+        trie = Trie()
+        for word in TEST_WORDS:
+            trie.insert(word)
+        for _ in range(2):
+            trie.increment_frequency("test7")
+        trie.increment_frequency("test3")
+
+        assert trie.autocomplete("test", max_results=3) == ["test7", "test3", "test0"]
+
+    def test_autocomplete_cache_invalidation(self):
+        """Test memoized autocomplete answers follow trie changes"""
+        trie = Trie()
+        trie.insert("help")
+        assert trie.autocomplete("he") == ["help"]
+
+        trie.insert("hello")
+        assert trie.autocomplete("he") == ["hello", "help"]
+
+        trie.increment_frequency("help")
+        assert trie.autocomplete("he") == ["help", "hello"]
+
+        trie.delete("help")
+        assert trie.autocomplete("he") == ["hello"]
+
     def test_delete(self):
         """Test deleting words from trie"""
         trie = Trie()
@@ -191,8 +228,7 @@ class TestTrie:
             trie.insert(word)
 
         all_words = trie.get_all_words()
-        for word in words:
-            assert word in all_words
+        assert set(all_words) == set(words)
 
     def test_empty_prefix(self):
         """Test autocomplete with empty prefix"""
@@ -203,7 +239,56 @@ class TestTrie:
         results = trie.autocomplete("")
         assert len(results) == 2
 
+    def test_wide_node(self):
+        """Test a node with more children than the array form holds"""
+        trie = Trie()
+        words = [f"x{chr(c)}" for c in range(ord('a'), ord('z') + 1)]
+        for word in reversed(words):
+            trie.insert(word)
+
+        assert trie.get_all_words() == words
+        assert trie.search("xq") is True
+
+        trie.delete("xq")
+        assert trie.search("xq") is False
+        assert len(trie.autocomplete("x", max_results=50)) == len(words) - 1
 
+    def test_bulk_insert(self):
+        """Test bulk insert builds the same trie as one-by-one inserts"""
+        words = ["help", "Hello", "hel", "world", "helmet", "hello", "w"]
+        one_by_one = Trie()
+        for word in words:
+            one_by_one.insert(word)
+
+        bulk = Trie()
+        bulk.insert("help")
+        bulk.bulk_insert(words)
+
+        assert len(bulk) == len(one_by_one)
+        assert bulk.get_all_words() == one_by_one.get_all_words()
+        assert bulk.autocomplete("he") == one_by_one.autocomplete("he")
+
+    def test_frozen_lookups_match(self):
+        """Test frozen trie answers like the node-based trie"""
+        trie = Trie()
+        for word in ["help", "hello", "helmet", "world", "hel"]:
+            trie.insert(word)
+        trie.increment_frequency("helmet")
+
+        queries = ["", "h", "hel", "hell", "helx", "world", "worlds"]
+        expected = [(trie.autocomplete(q, 3), trie.search(q), trie.starts_with(q)) for q in queries]
+
+        trie.freeze()
+        assert trie.is_frozen()
+        assert [(trie.autocomplete(q, 3), trie.search(q), trie.starts_with(q)) for q in queries] == expected
+        assert trie.autocomplete("hel") == ["helmet", "hel", "hello", "help"]
+
+        trie.insert("helium")
+        assert not trie.is_frozen()
+        assert "helium" in trie.autocomplete("heli")
+
+
+@pytest.mark.xdist_group(name="trie")
 class TestSymptomTrie:
     """Tests for SymptomTrie specialized implementation"""
 
@@ -214,12 +299,28 @@ class TestSymptomTrie:
 
         results = st.autocomplete_with_data("head")
         assert len(results) > 0
-        assert results[0]['word'] == "headache"
-        assert results[0]['category'] == "neurological"
+        assert EXPECTED_HEADACHE_DATA.items() <= results[0].items()
+
+    def test_save_and_load(self, tmp_path):
+        """Test a saved trie loads back frozen, with its metadata"""
+        st = SymptomTrie()
+        st.insert_symptom("headache", category="neurological")
+        st.insert_symptom("heartburn", category="digestive")
+        st.freeze()
+        st.autocomplete("he")
+
+        path = tmp_path / "trie.pkl"
+        st.save(path)
+        loaded = SymptomTrie.load(path)
+
+        assert loaded.is_frozen()
+        assert loaded.autocomplete("he") == ["headache", "heartburn"]
+        assert loaded.get_symptom_data("heartburn")['category'] == "digestive"
 
 
 # ==================== BST Tests ====================
 
+@pytest.mark.xdist_group(name="bst")
 class TestBST:
     """Tests for basic BST implementation"""
 
@@ -241,67 +342,41 @@ class TestBST:
 
         assert bst.search(10) is None
 
-    def test_inorder_traversal(self):
-        """Test inorder traversal returns sorted order"""
+    @settings(max_examples=50, deadline=None)
+    @given(
+        # A narrow key range makes repeated keys common, as with the
+        # effectiveness scores RecommendationBST is keyed on
+        keys=st.lists(st.integers(min_value=-100, max_value=100), max_size=200),
+        n=st.integers(min_value=0, max_value=210),
+        bounds=st.tuples(st.integers(-110, 110), st.integers(-110, 110)).map(sorted),
+    )
+    def test_ordering_invariants(self, keys, n, bounds):
+        """Test traversals, top N, min/max, range queries and balance on any insert order"""
         bst = BST()
-        values = [5, 3, 7, 1, 9, 4, 6]
-        for v in values:
-            bst.insert(v, str(v))
-
-        result = bst.inorder_traversal()
-        keys = [node[0] for node in result]
-
-        assert keys == sorted(keys)
-
-    def test_reverse_inorder_traversal(self):
-        """Test reverse inorder traversal returns descending order"""
-        bst = BST()
-        values = [5, 3, 7, 1, 9]
-        for v in values:
-            bst.insert(v, str(v))
-
-        result = bst.reverse_inorder_traversal()
-        keys = [node[0] for node in result]
-
-        assert keys == sorted(keys, reverse=True)
-
-    def test_get_top_n(self):
-        """Test getting top N elements"""
-        bst = BST()
-        for i in range(10):
-            bst.insert(i, f"value{i}")
-
-        top_5 = bst.get_top_n(5)
-        assert len(top_5) == 5
-        # Top should be highest keys
-        keys = [node[0] for node in top_5]
-        assert keys == [9, 8, 7, 6, 5]
-
-    def test_find_min_max(self):
-        """Test finding min and max"""
-        bst = BST()
-        values = [5, 3, 7, 1, 9]
-        for v in values:
-            bst.insert(v, str(v))
-
-        min_node = bst.find_min()
-        max_node = bst.find_max()
-
-        assert min_node[0] == 1
-        assert max_node[0] == 9
-
-    def test_get_in_range(self):
-        """Test getting values in range"""
-        bst = BST()
-        for i in range(10):
-            bst.insert(i, f"value{i}")
-
-        in_range = bst.get_in_range(3, 7)
-        keys = [node[0] for node in in_range]
-
-        assert all(3 <= k <= 7 for k in keys)
+        for position, key in enumerate(keys):
+            bst.insert(key, position)
+
+        # Equal keys: earliest inserted first in descending order, so in
+        # reverse insertion order ascending (stable sort of the reversed list)
+        ascending = sorted(reversed(list(enumerate(keys))), key=itemgetter(1))
+        ascending = [(key, position) for position, key in ascending]
+        descending = ascending[::-1]
+        low, high = bounds
+
+        assert bst.inorder_traversal() == ascending
+        assert bst.reverse_inorder_traversal() == descending
+        assert bst.get_top_n(n) == descending[:n]
+        assert bst.get_in_range(low, high) == [
+            item for item in ascending if low <= item[0] <= high
+        ]
+        assert bst.find_min() == (ascending[0] if keys else None)
+        assert bst.find_max() == (descending[0] if keys else None)
+        assert len(bst) == len(keys)
+        # AVL bound: height stays within ~1.44 * log2(n + 2)
+        assert bst.height() <= 1.45 * log2(len(keys) + 2)
 
 
+@pytest.mark.xdist_group(name="bst")
 class TestRecommendationBST:
     """Tests for RecommendationBST specialized implementation"""
 
@@ -332,6 +407,7 @@ class TestRecommendationBST:
 
 # ==================== Graph Tests ====================
 
+@pytest.mark.xdist_group(name="graph")
 class TestGraph:
     """Tests for basic Graph implementation"""
 
@@ -356,36 +432,15 @@ class TestGraph:
         assert neighbors[0]['node'] == "B"
         assert neighbors[0]['weight'] == 5
 
-    def test_bfs(self):
+    def test_bfs(self, populated_graph):
         """Test breadth-first search"""
-        g = Graph()
-        g.add_node("A")
-        g.add_node("B")
-        g.add_node("C")
-        g.add_node("D")
-        g.add_edge("A", "B")
-        g.add_edge("A", "C")
-        g.add_edge("B", "D")
-
-        visited = g.bfs("A")
-        assert "A" in visited
-        assert "B" in visited
-        assert "C" in visited
-        assert "D" in visited
+        visited = populated_graph.bfs("A")
+        assert set(visited) == {"A", "B", "C", "D"}
 
-    def test_dfs(self):
+    def test_dfs(self, populated_graph):
         """Test depth-first search"""
-        g = Graph()
-        g.add_node("A")
-        g.add_node("B")
-        g.add_node("C")
-        g.add_edge("A", "B")
-        g.add_edge("B", "C")
-
-        visited = g.dfs("A")
-        assert "A" in visited
-        assert "B" in visited
-        assert "C" in visited
+        visited = populated_graph.dfs("A")
+        assert set(visited) == {"A", "B", "C", "D"}
 
     def test_find_path(self):
         """Test finding path between nodes"""
@@ -415,61 +470,87 @@ class TestGraph:
         assert len(neighbors) == 0
 
 
+@pytest.mark.xdist_group(name="graph")
 class TestHealthGraph:
     """Tests for HealthGraph specialized implementation"""
 
-    def test_add_symptom_and_remedy(self):
+    def test_add_symptom_and_remedy(self, health_graph):
         """Test adding symptoms and remedies"""
-        hg = HealthGraph()
-        hg.add_symptom("headache", {"category": "neurological"})
-        hg.add_remedy("Ginger Tea", {"effectiveness": 8})
-
-        assert "symptom:headache" in hg.adjacency_list
-        assert "remedy:ginger tea" in hg.adjacency_list
+        assert "symptom:headache" in health_graph.adjacency_list
+        assert "remedy:ginger tea" in health_graph.adjacency_list
 
-    def test_link_symptom_to_remedy(self):
+    def test_link_symptom_to_remedy(self, health_graph):
         """Test linking symptoms to remedies"""
-        hg = HealthGraph()
-        hg.add_symptom("headache")
-        hg.add_remedy("Ginger Tea")
-        hg.link_symptom_to_remedy("headache", "Ginger Tea", effectiveness=8)
-
-        remedies = hg.get_remedies_for_symptom("headache")
+        remedies = health_graph.get_remedies_for_symptom("headache")
         assert len(remedies) > 0
-        assert remedies[0]['name'].lower() == "ginger tea"
+        assert EXPECTED_GINGER_TEA_LINK.items() <= remedies[0].items()
 
-    def test_get_recommendations_for_symptoms(self):
+    def test_get_recommendations_for_symptoms(self, health_graph):
         """Test getting recommendations for multiple symptoms"""
-        hg = HealthGraph()
-        hg.add_symptom("headache")
-        hg.add_symptom("nausea")
-        hg.add_remedy("Ginger Tea")
-        hg.add_diet_plan("Light Diet")
-
-        hg.link_symptom_to_remedy("headache", "Ginger Tea", effectiveness=8)
-        hg.link_symptom_to_remedy("nausea", "Ginger Tea", effectiveness=9)
-        hg.link_symptom_to_diet("headache", "Light Diet", effectiveness=7)
-
-        recommendations = hg.get_recommendations_for_symptoms(["headache", "nausea"])
+        recommendations = health_graph.get_recommendations_for_symptoms(["headache", "nausea"])
 
         assert 'remedies' in recommendations
         assert 'diet_plans' in recommendations
         assert len(recommendations['remedies']) > 0
 
-    def test_link_related_symptoms(self):
+    def test_link_related_symptoms(self, health_graph):
         """Test linking related symptoms"""
+        related = health_graph.get_related_symptoms("headache")
+        assert len(related) > 0
+        assert related[0]['symptom'] == "migraine"
+
+    def test_memoized_lookups_see_new_links(self):
+        """Test cached symptom lookups are dropped when the graph changes"""
         hg = HealthGraph()
-        hg.add_symptom("headache")
-        hg.add_symptom("migraine")
+        hg.link_symptom_to_remedy("headache", "Ginger Tea", effectiveness=6)
+        assert len(hg.get_remedies_for_symptom("headache")) == 1
+
+        hg.link_symptom_to_remedy("headache", "Peppermint Oil", effectiveness=9)
+        remedies = hg.get_remedies_for_symptom("headache")
+        assert [r['name'] for r in remedies] == ["Peppermint Oil", "Ginger Tea"]
+
+    def test_memoized_lookups_are_read_only(self):
+        """Test a returned lookup entry cannot change later answers"""
+        hg = HealthGraph()
+        hg.link_symptom_to_remedy("headache", "Ginger Tea", effectiveness=8)
+        hg.link_symptom_to_diet("headache", "Light Diet", effectiveness=7)
         hg.link_related_symptoms("headache", "migraine")
 
-        related = hg.get_related_symptoms("headache")
-        assert len(related) > 0
-        assert related[0]['symptom'] == "migraine"
+        lookups = (
+            (hg.get_remedies_for_symptom, 'effectiveness'),
+            (hg.get_diet_plans_for_symptom, 'effectiveness'),
+            (hg.get_related_symptoms, 'strength'),
+        )
+        for lookup, field in lookups:
+            before = dict(lookup("headache")[0])
+            with pytest.raises(TypeError):
+                lookup("headache")[0][field] = 0
+            assert dict(lookup("headache")[0]) == before
+
+    def test_frozen_recommendations_match(self):
+        """Test frozen (CSR) scoring gives the same result as the dict path"""
+        pytest.importorskip("numpy")
+        hg = HealthGraph()
+        hg.link_symptom_to_remedy("headache", "Ginger Tea", effectiveness=8)
+        hg.link_symptom_to_remedy("headache", "Peppermint Oil", effectiveness=8)
+        hg.link_symptom_to_remedy("nausea", "Ginger Tea", effectiveness=9)
+        hg.link_symptom_to_remedy("nausea", "Lemon Water", effectiveness=6)
+        hg.link_symptom_to_diet("headache", "Light Diet", effectiveness=7)
+
+        symptoms = ["nausea", "headache", "unknown"]
+        expected = hg.get_recommendations_for_symptoms(symptoms)
+
+        assert hg.freeze()
+        assert hg.get_recommendations_for_symptoms(symptoms) == expected
+
+        # Any mutation drops the snapshot
+        hg.link_symptom_to_diet("nausea", "Light Diet", effectiveness=5)
+        assert not hg.is_frozen()
 
 
 # ==================== Queue Tests ====================
 
+@pytest.mark.xdist_group(name="queue")
 class TestQueue:
     """Tests for basic Queue implementation"""
 
@@ -493,22 +574,15 @@ class TestQueue:
         assert q.peek() == 1
         assert q.size() == 2  # Still has 2 items
 
-    def test_is_empty(self):
-        """Test empty check"""
-        q = Queue()
-        assert q.is_empty() is True
-
-        q.enqueue(1)
-        assert q.is_empty() is False
-
-    def test_size(self):
-        """Test size tracking"""
+    @pytest.mark.parametrize("items", QUEUE_CONTENTS)
+    def test_size_and_is_empty(self, items):
+        """Test size tracking and the empty check"""
         q = Queue()
-        assert q.size() == 0
+        for item in items:
+            q.enqueue(item)
 
-        q.enqueue(1)
-        q.enqueue(2)
-        assert q.size() == 2
+        assert q.size() == len(items)
+        assert q.is_empty() is (not items)
 
     def test_clear(self):
         """Test clearing queue"""
@@ -525,6 +599,7 @@ class TestQueue:
         assert q.dequeue() is None
 
 
+@pytest.mark.xdist_group(name="queue")
 class TestPriorityQueue:
     """Tests for PriorityQueue implementation"""
 
@@ -560,6 +635,7 @@ class TestPriorityQueue:
         assert pq.size() == 2
 
 
+@pytest.mark.xdist_group(name="queue")
 class TestReminderQueue:
     """Tests for ReminderQueue specialized implementation"""
 
@@ -597,7 +673,7 @@ class TestReminderQueue:
         reminder_id = rq.add_diet_reminder("Breakfast", ["Oatmeal", "Fruits"], "08:00")
 
         all_reminders = rq.get_all_reminders()
-        assert all_reminders[0]['type'] == "diet"
+        assert EXPECTED_DIET_REMINDER.items() <= all_reminders[0].items()
 
     def test_add_remedy_reminder(self):
         """Test adding remedy-specific reminder"""
@@ -605,9 +681,10 @@ class TestReminderQueue:
         rq.add_remedy_reminder("Ginger Tea", "Drink while warm", "09:00")
 
         all_reminders = rq.get_all_reminders()
-        assert all_reminders[0]['type'] == "remedy"
+        assert EXPECTED_REMEDY_REMINDER.items() <= all_reminders[0].items()
 
 
+@pytest.mark.xdist_group(name="queue")
 class TestSymptomHistoryQueue:
     """Tests for SymptomHistoryQueue specialized implementation"""
 
@@ -636,8 +713,8 @@ class TestSymptomHistoryQueue:
     def test_get_history_with_limit(self):
         """Test getting limited history"""
         shq = SymptomHistoryQueue()
-        for i in range(10):
-            shq.add_symptom_record([f"symptom{i}"], 5, {})
+        for symptoms, severity, recommendations in HISTORY_BATCH:
+            shq.add_symptom_record(symptoms, severity, recommendations)
 
         history = shq.get_history(limit=5)
         assert len(history) == 5
@@ -645,10 +722,44 @@ class TestSymptomHistoryQueue:
     def test_max_size_limit(self):
         """Test that max size limit is respected"""
         shq = SymptomHistoryQueue(max_size=5)
-        for i in range(10):
-            shq.add_symptom_record([f"symptom{i}"], 5, {})
+        for symptoms, severity, recommendations in HISTORY_BATCH:
+            shq.add_symptom_record(symptoms, severity, recommendations)
+
+        assert shq.size() == 5
+
+    def test_bulk_add_keeps_newest(self):
+        """Test bulk loading past max size keeps only the newest records"""
+        shq = SymptomHistoryQueue(max_size=5)
+        shq.bulk_add(
+            {"symptoms": [symptom], "severity": 5, "recommendations": {}}
+            for symptom in SYMPTOM_NAMES
+        )
 
         assert shq.size() == 5
+        history = shq.get_history()
+        assert [r['symptoms'][0] for r in history] == list(SYMPTOM_NAMES[:-6:-1])
+        assert all('timestamp' in r for r in history)
+
+    def test_bulk_add_orders_and_normalises_timestamps(self):
+        """Test bulk-loaded records of any order and ISO form stay visible to get_recent_symptoms"""
+        now = datetime.now()
+        shq = SymptomHistoryQueue(max_size=10)
+        shq.add_symptom_record(["held"], 5, {})
+        shq.bulk_add([
+            {"symptoms": ["yesterday"], "severity": 5, "recommendations": {},
+             "timestamp": (now - timedelta(days=1)).astimezone(timezone.utc)
+             .strftime("%Y-%m-%dT%H:%M:%SZ")},
+            {"symptoms": ["old"], "severity": 5, "recommendations": {},
+             "timestamp": (now - timedelta(days=30)).isoformat()},
+            {"symptoms": ["hour ago"], "severity": 5, "recommendations": {},
+             "timestamp": (now - timedelta(hours=1)).astimezone(timezone.utc).isoformat()},
+        ])
+
+        history = [r['symptoms'][0] for r in shq.get_history()]
+        assert history == ["held", "hour ago", "yesterday", "old"]
+        recent = [r['symptoms'][0] for r in shq.get_recent_symptoms(days=7)]
+        assert recent == ["held", "hour ago", "yesterday"]
+        assert dict(shq.get_symptom_frequency()) == dict.fromkeys(history, 1)
 
     def test_get_symptom_frequency(self):
         """Test symptom frequency analysis"""
@@ -659,12 +770,74 @@ class TestSymptomHistoryQueue:
 
         frequency = shq.get_symptom_frequency()
         # Should be sorted by frequency
-        assert frequency[0][0] == "headache"
-        assert frequency[0][1] == 3
+        assert frequency == [("headache", 3), ("nausea", 1)]
+
+    def test_symptom_frequency_after_eviction(self):
+        """Test evicted and dequeued records drop out of the frequency counts"""
+        shq = SymptomHistoryQueue(max_size=2)
+        shq.add_symptom_record(["Headache"], 5, {})
+        shq.add_symptom_record(["headache", "nausea"], 5, {})
+        shq.add_symptom_record(["nausea"], 5, {})
+        assert shq.get_symptom_frequency() == [("nausea", 2), ("headache", 1)]
+
+        shq.bulk_add({"symptoms": ["cough"], "severity": 5, "recommendations": {}}
+                     for _ in range(3))
+        assert shq.get_symptom_frequency() == [("cough", 2)]
+
+        shq.dequeue()
+        assert shq.get_symptom_frequency() == [("cough", 1)]
+        shq.clear()
+        assert shq.get_symptom_frequency() == []
+
+    def test_symptom_frequency_with_concurrent_adds(self):
+        """Test running counts match a full recount after threaded adds"""
+        shq = SymptomHistoryQueue(max_size=20)
+
+        def add_records(offset):
+            for i in range(5000):
+                shq.add_symptom_record([f"s{(i + offset) % 7}"], 5, {})
+
+        threads = [threading.Thread(target=add_records, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        recount = Counter(
+            symptom for record in shq.get_history() for symptom in record['symptoms']
+        )
+        assert shq.size() == 20
+        assert dict(shq.get_symptom_frequency()) == dict(recount)
+
+
+# ==================== Benchmarks ====================
+
+@pytest.mark.benchmark
+@pytest.mark.xdist_group(name="benchmark")
+class TestBenchmarks:
+    """Timings on a 10k-word corpus; deselected by default, run with `pytest -m benchmark`"""
+
+    def test_autocomplete_benchmark(self, benchmark, big_trie, word_corpus):
+        """Time trie autocomplete and check it against a linear scan over every word"""
+        def linear_scan(prefix, max_results):
+            # Same ranking as the trie when no word has been searched yet
+            return heapq.nsmallest(
+                max_results, (w for w in word_corpus if w.startswith(prefix))
+            )
+
+        # _autocomplete skips the memo, so every round walks the trie
+        results = benchmark(big_trie._autocomplete, "pre", 10)
+        assert results == linear_scan("pre", 10)
+
+    def test_search_partial_benchmark(self, benchmark, big_symptom_table, word_corpus):
+        """Test substring search over a 10k-symptom table"""
+        results = benchmark(big_symptom_table.search_partial, "pre")
+        assert {key for key, _ in results} == {w for w in word_corpus if "pre" in w}
 
 
 # ==================== Integration Tests ====================
 
+@pytest.mark.integration
 class TestDataStructureIntegration:
     """Integration tests combining multiple data structures"""
 
@@ -711,8 +884,3 @@ class TestDataStructureIntegration:
         graph_results = graph.get_recommendations_for_symptoms(["headache"])
         assert len(graph_results['remedies']) > 0
 
-
-# ==================== Run Tests ====================
-
-if __name__ == '__main__':
-    pytest.main([__file__, '-v', '--tb=short'])
@@ -0,0 +1,14 @@
+"""
+Smart Health Management System
+WSGI entry point for production servers
+
+Usage: gunicorn -k gthread -w 4 --threads 4 -b 0.0.0.0:5000 wsgi:app
+"""
+
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from app import app  # noqa: E402